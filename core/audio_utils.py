@@ -0,0 +1,77 @@
+"""
+Audio helpers shared by the TTS (gen_audio) and caption (gen_caption) pipelines.
+Kept free of heavy imports so both modules can use them at import time.
+"""
+import re
+import json
+import math
+import typing
+
+# In-process normalization never applies more than this much gain (either direction)
+LOUDNORM_MAX_GAIN_DB = 12.0
+# True peak is measured on a 4x oversampled signal (ITU-R BS.1770, as ffmpeg's ebur128/loudnorm)
+TRUE_PEAK_OVERSAMPLE = 4
+# Frames per oversampling block, plus context on each side to keep block edges exact
+TRUE_PEAK_BLOCK = 1 << 16
+TRUE_PEAK_CONTEXT = 64
+
+
+def parse_loudnorm_json(stderr: bytes) -> typing.Optional[dict]:
+    """Extract the stats block a loudnorm print_format=json analysis pass prints last."""
+    blocks = re.findall(r"\{[^{}]*\}", stderr.decode(errors="ignore"))
+    if not blocks:
+        return None
+    try:
+        return json.loads(blocks[-1])
+    except json.JSONDecodeError:
+        return None
+
+
+def loudnorm_filter(base_filter: str, measured: dict) -> str:
+    """Second-pass loudnorm filter fed with first-pass measurements (linear gain)."""
+    return (
+        f"{base_filter}"
+        f":measured_I={measured['input_i']}"
+        f":measured_TP={measured['input_tp']}"
+        f":measured_LRA={measured['input_lra']}"
+        f":measured_thresh={measured['input_thresh']}"
+        f":offset={measured['target_offset']}"
+        ":linear=true"
+    )
+
+
+def true_peak(data) -> float:
+    """
+    Absolute true peak of a float numpy array (frames[, channels]): the sample peak of
+    the signal oversampled TRUE_PEAK_OVERSAMPLE times, processed in blocks to bound memory.
+    """
+    from scipy.signal import resample_poly  # scipy comes with pyloudnorm
+    
+    peak = 0.0
+    for start in range(0, len(data), TRUE_PEAK_BLOCK):
+        lo = max(start - TRUE_PEAK_CONTEXT, 0)
+        hi = min(start + TRUE_PEAK_BLOCK + TRUE_PEAK_CONTEXT, len(data))
+        up = resample_poly(data[lo:hi], TRUE_PEAK_OVERSAMPLE, 1, axis=0)
+        # Only the block itself counts; the context just feeds the filter
+        first = (start - lo) * TRUE_PEAK_OVERSAMPLE
+        last = (min(start + TRUE_PEAK_BLOCK, len(data)) - lo) * TRUE_PEAK_OVERSAMPLE
+        peak = max(peak, float(abs(up[first:last]).max()))
+    return peak
+
+
+def apply_loudness_gain(data, loudness: float, target_lufs: float, peak_ceiling: float):
+    """
+    Single linear gain from the measured integrated loudness to target_lufs, clamped
+    to ±LOUDNORM_MAX_GAIN_DB and pulled down so the true peak stays under peak_ceiling
+    (plain gain has no limiter). `data` is a float numpy array, scaled in place.
+    Returns (data, shortfall_db): how far the clamp/ceiling left the result from target_lufs.
+    """
+    wanted_db = target_lufs - loudness
+    gain_db = max(-LOUDNORM_MAX_GAIN_DB, min(LOUDNORM_MAX_GAIN_DB, wanted_db))
+    
+    # Gain is linear, so the true peak scales with it
+    peak = true_peak(data) * 10 ** (gain_db / 20) if len(data) else 0.0
+    if peak > peak_ceiling:
+        gain_db += 20 * math.log10(peak_ceiling / peak)
+    data *= 10 ** (gain_db / 20)
+    return data, wanted_db - gain_db
@@ -1,33 +1,247 @@
 import os
 import sys
 import asyncio
+import codecs
+import functools
+import math
+import re
 import subprocess
 from pathlib import Path
 import typing
 
+import numpy as np
+import soundfile as sf
+
+from core.audio_utils import parse_loudnorm_json, loudnorm_filter, apply_loudness_gain
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+# Buffer size for the inference log pipe (StreamReader limit and OS pipe)
+PIPE_BUFFER_SIZE = 1 << 20
+
+# Trim leading silence and shrink every inner gap > 500ms (-45dB) down to 200ms
+SILENCE_FILTER = (
+    "silenceremove="
+    "start_periods=1:start_silence=0.1:start_threshold=-45dB:"
+    "stop_periods=-1:stop_duration=0.5:stop_threshold=-45dB:stop_silence=0.2"
+)
+# Probe for clips already in spec (one decode, no encode). silenceremove leaves
+# stop_duration + stop_silence (0.7s) of each trimmed gap, so only longer gaps count.
+PROBE_FILTER = "silencedetect=n=-45dB:d=0.75,ebur128=peak=true:framelog=quiet"
+# EBU R128 normalization target (-14 LUFS, -1 dBTP); used as-is for single-pass
+LOUDNORM_FILTER = "loudnorm=I=-14:TP=-1.0:LRA=11"
+# In-process normalization (pyloudnorm) targets the same -14 LUFS / -1 dBTP
+LOUDNORM_TARGET_LUFS = -14.0
+LOUDNORM_PEAK_CEILING = 10 ** (-1.0 / 20)
+# In-process results the clamp/ceiling would leave further than this from the target
+# go through ffmpeg loudnorm instead (its true-peak limiter reaches the target)
+LOUDNORM_MAX_SHORTFALL_DB = 0.5
+# Silero VAD runs on 16kHz audio in 512-sample chunks (32ms)
+VAD_SAMPLE_RATE = 16000
+VAD_CHUNK = 512
+VAD_THRESHOLD = 0.5
+
+
+@functools.lru_cache(maxsize=None)
+def _load_vad() -> tuple[typing.Any, typing.Optional[str]]:
+    """
+    Silero VAD on CUDA, loaded once from the installed silero-vad package (the model
+    weights ship with it, so nothing is fetched at run time).
+    Returns (model, None), or (None, reason) when it can't be used; the reason is None
+    when there is simply no CUDA, so CPU hosts fall back to ffmpeg silently.
+    """
+    try:
+        import torch  # Heavy; only imported once silence trimming needs it
+    except ImportError:
+        return None, None
+    if not torch.cuda.is_available():
+        return None, None
+    try:
+        from silero_vad import load_silero_vad
+        return load_silero_vad().to("cuda").eval(), None
+    except Exception as e:
+        return None, f"Silero VAD unavailable, using ffmpeg silenceremove: {e}"
+
+
+@functools.lru_cache(maxsize=None)
+def _load_pyloudnorm():
+    """pyloudnorm, imported once (it pulls in scipy). None when not installed."""
+    try:
+        import pyloudnorm
+        return pyloudnorm
+    except ImportError:
+        return None
+
+
+def _loudnorm_pcm(pyln, src: Path, dst: Path) -> typing.Optional[float]:
+    """
+    Measure integrated loudness and apply a single linear gain to LOUDNORM_TARGET_LUFS
+    (see apply_loudness_gain). Returns None for digital silence, otherwise how many dB
+    the gain clamp/true-peak ceiling left the result short of the target. dst is only
+    written when that is within LOUDNORM_MAX_SHORTFALL_DB.
+    """
+    data, sr = sf.read(str(src), dtype="float64", always_2d=True)
+    loudness = pyln.Meter(sr).integrated_loudness(data)
+    if not math.isfinite(loudness):
+        return None
+    
+    data, shortfall_db = apply_loudness_gain(data, loudness, LOUDNORM_TARGET_LUFS, LOUDNORM_PEAK_CEILING)
+    if abs(shortfall_db) > LOUDNORM_MAX_SHORTFALL_DB:
+        return shortfall_db
+    
+    if dst.suffix.lower() == ".wav":
+        sf.write(str(dst), data, sr, subtype="PCM_16")
+    else:
+        sf.write(str(dst), data, sr)
+    return shortfall_db
+
+
+def _vad_speech_spans(samples: np.ndarray, sr: int) -> list[tuple[int, int]]:
+    """
+    (start, end) frame indices of speech between pauses > 500ms, keeping 100ms of
+    each pause. Speech probabilities are computed for the whole clip in one GPU call.
+    """
+    import torch
+    import torchaudio
+    
+    model, _ = _load_vad()
+    mono = torch.from_numpy(samples.mean(axis=1, dtype=np.float32) / 32768.0).to("cuda")
+    x = torchaudio.functional.resample(mono, sr, VAD_SAMPLE_RATE)
+    with torch.no_grad():
+        speech = model.audio_forward(x.unsqueeze(0), sr=VAD_SAMPLE_RATE)[0] > VAD_THRESHOLD
+    model.reset_states()
+    
+    # Run-length encode on the GPU; only the run boundaries go back to the host
+    n = len(speech)
+    if n == 0:
+        # Shorter than one VAD chunk
+        return []
+    edges = (torch.nonzero(torch.diff(speech.to(torch.int8))).flatten() + 1).cpu().numpy()
+    run_starts = np.concatenate(([0], edges))
+    run_ends = np.concatenate((edges, [n]))
+    # Runs alternate between speech and pause, starting with speech[0]
+    is_speech = (np.arange(len(run_starts)) % 2 == 0) == bool(speech[0])
+    
+    min_pause = math.ceil(0.5 * VAD_SAMPLE_RATE / VAD_CHUNK)
+    long_pause = ~is_speech & (run_ends - run_starts >= min_pause)
+    
+    # Speech spans are the complement of the long pauses
+    span_starts = np.concatenate(([0], run_ends[long_pause]))
+    span_ends = np.concatenate((run_starts[long_pause], [n]))
+    keep = span_ends > span_starts
+    
+    frames_per_chunk = VAD_CHUNK * sr / VAD_SAMPLE_RATE
+    pad = int(0.1 * sr)
+    starts = np.maximum((span_starts[keep] * frames_per_chunk).astype(np.int64) - pad, 0)
+    ends = np.minimum((span_ends[keep] * frames_per_chunk).astype(np.int64) + pad, len(samples))
+    return list(zip(starts.tolist(), ends.tolist()))
+
+
+def _rejoin_spans(samples: np.ndarray, spans: list[tuple[int, int]], gap_len: int) -> np.ndarray:
+    """Copy the kept spans into one preallocated int16 buffer, zero-filled gaps between them."""
+    total = sum(end - start for start, end in spans) + gap_len * (len(spans) - 1)
+    out = np.empty((total, samples.shape[1]), dtype=np.int16)
+    cursor = 0
+    for i, (start, end) in enumerate(spans):
+        if i:
+            out[cursor:cursor + gap_len] = 0
+            cursor += gap_len
+        length = end - start
+        np.copyto(out[cursor:cursor + length], samples[start:end])
+        cursor += length
+    return out
+
+
+def _grow_pipe_buffer(process: asyncio.subprocess.Process) -> None:
+    """Enlarge the child's stdout pipe (Linux only) so log bursts don't block its writes."""
+    if fcntl is None or not hasattr(fcntl, "F_SETPIPE_SZ"):
+        return
+    try:
+        pipe = process._transport.get_pipe_transport(1).get_extra_info("pipe")
+        fcntl.fcntl(pipe.fileno(), fcntl.F_SETPIPE_SZ, PIPE_BUFFER_SIZE)
+    except (AttributeError, OSError):
+        pass  # Best effort, e.g. above /proc/sys/fs/pipe-max-size
+
+
+@functools.lru_cache(maxsize=None)
+def _find_python(base_dir: Path) -> str:
+    """Resolve the python executable for inference, searched once per base_dir."""
+    # Try to find venv python to ensure dependencies like pytorch_lightning are found
+    # Check .venv first (standard poetry/modern convention)
+    potential_venvs = [
+        base_dir / ".venv" / "bin" / "python",       # Unix .venv
+        base_dir / ".venv" / "Scripts" / "python.exe", # Win .venv
+        base_dir / "venv" / "bin" / "python",        # Unix venv
+        base_dir / "venv" / "Scripts" / "python.exe"   # Win venv
+    ]
+    
+    for p in potential_venvs:
+        if p.exists():
+            print(f"[*] Using venv python: {p}")
+            return str(p)
+    return sys.executable
+
+
+def _ffmpeg_filter_cmd(src: Path, dst: Path, filter_str: str) -> list[str]:
+    """
+    ffmpeg command rendering src through an audio filtergraph into dst (codec from suffix).
+    Logs only errors, so the captured stderr stays small and is only read on failure.
+    """
+    output_fmt = dst.suffix.lstrip(".")
+    codec = "libmp3lame" if output_fmt == "mp3" else "pcm_s16le"
+    return [
+        "ffmpeg", "-y", "-v", "error",
+        "-i", str(src),
+        "-af", filter_str,
+        "-c:a", codec,
+        str(dst)
+    ]
+
+
 class GenAudio:
     def __init__(self, base_dir: Path):
         self.base_dir = base_dir
-        self.python_exe = sys.executable
-        
-        # Try to find venv python to ensure dependencies like pytorch_lightning are found
-        # Check .venv first (standard poetry/modern convention)
-        potential_venvs = [
-            base_dir / ".venv" / "bin" / "python",       # Unix .venv
-            base_dir / ".venv" / "Scripts" / "python.exe", # Win .venv
-            base_dir / "venv" / "bin" / "python",        # Unix venv
-            base_dir / "venv" / "Scripts" / "python.exe"   # Win venv
-        ]
-        
-        for p in potential_venvs:
-            if p.exists():
-                print(f"[*] Using venv python: {p}")
-                self.python_exe = str(p)
-                break
+        self.python_exe = _find_python(base_dir)
         
         # Correct path to inference_cli.py based on file structure
         self.inference_script = base_dir / "external" / "GPT-SoVITS" / "GPT_SoVITS" / "inference_cli.py"
         
+        # Force environment to use UTF-8 (built once; the child gets its own copy at spawn)
+        self._subproc_env = {**os.environ, "PYTHONIOENCODING": "utf-8"}
+        
+        # Invariant inference args for the last voice used (see bind_voice)
+        self._bound_voice: typing.Optional[tuple] = None
+        self._cmd_prefix: typing.Optional[list[str]] = None
+        
+        # Silero VAD load failures are logged through the first generator that hits them
+        self._vad_notice_shown = False
+        
+    def bind_voice(
+        self,
+        gpt_model_path: Path,
+        sovits_model_path: Path,
+        ref_audio_path: Path,
+        ref_text: str,
+        ref_language: str,
+    ):
+        """Precompute the inference command prefix shared by every line of a voice."""
+        self._bound_voice = (gpt_model_path, sovits_model_path, ref_audio_path, ref_text, ref_language)
+        self._cmd_prefix = [
+            self.python_exe,
+            str(self.inference_script),
+            "--gpt_model", str(gpt_model_path),
+            "--sovits_model", str(sovits_model_path),
+            "--ref_audio", str(ref_audio_path),
+            "--ref_text", ref_text,
+            # Map common language codes to CLI expected codes if needed, 
+            # but inference_cli.py seems to accept "en", "ja", "ko", "zh" directly.
+            "--ref_language", ref_language,
+            "--text_split_method", "cut5"
+        ]
+        
     async def async_generate_voice(
         self,
         gpt_model_path: Path,
@@ -48,64 +262,65 @@ class GenAudio:
         if not self.inference_script.exists():
              yield f"[!] Error: inference_cli.py not found at {self.inference_script}"
              return
-
-        # Prepare Command
+        
+        # Prepare Command (voice-specific prefix is built once per voice)
+        voice = (gpt_model_path, sovits_model_path, ref_audio_path, ref_text, ref_language)
+        if voice != self._bound_voice:
+            self.bind_voice(*voice)
+        
         cmd = [
-            self.python_exe,
-            str(self.inference_script),
-            "--gpt_model", str(gpt_model_path),
-            "--sovits_model", str(sovits_model_path),
-            "--ref_audio", str(ref_audio_path),
-            "--ref_text", ref_text,
-            # Map common language codes to CLI expected codes if needed, 
-            # but inference_cli.py seems to accept "en", "ja", "ko", "zh" directly.
-            "--ref_language", ref_language,
+            *self._cmd_prefix,
             "--target_text", target_text,
             "--target_language", target_language,
             "--output_path", str(output_path),
             "--speed_factor", str(speed_factor),
-            "--text_split_method", "cut5" 
         ]
         
         # Working directory should be the route of GPT-SoVITS to ensure imports work
         cwd = self.inference_script.parent.parent
         
         # Debug Log
-        safe_cmd = ' '.join([str(c) for c in cmd])
+        safe_cmd = ' '.join(cmd)
         # Truncate long text for display
         display_cmd = safe_cmd[:200] + "..." if len(safe_cmd) > 200 else safe_cmd
         yield f"[*] Executing: {display_cmd}"
         
         try:
-            # Force environment to use UTF-8
-            env = os.environ.copy()
-            env["PYTHONIOENCODING"] = "utf-8"
-            
             process = await asyncio.create_subprocess_exec(
                 *cmd,
                 stdout=asyncio.subprocess.PIPE,
                 stderr=asyncio.subprocess.STDOUT,
                 cwd=str(cwd),
-                env=env
+                env=self._subproc_env,
+                limit=PIPE_BUFFER_SIZE
             )
+            _grow_pipe_buffer(process)
             
-            # Read output real-time
+            # Read output real-time in bulk chunks; split lines in memory.
+            # PYTHONIOENCODING forces utf-8, so one incremental decoder handles chars split across chunks.
+            decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+            # Pieces of the current unterminated line (tqdm bars can run long without "\n");
+            # joined once when the line ends so each chunk is only scanned once.
+            partial = []
             while True:
-                line = await process.stdout.readline()
-                if not line:
-                    break
+                chunk = await process.stdout.read(65536)
+                *lines, tail = decoder.decode(chunk, final=not chunk).split("\n")
+                
+                if lines:
+                    lines[0] = "".join(partial) + lines[0]
+                    partial.clear()
+                for line in lines:
+                    line = line.strip()
+                    if line:
+                        yield line
+                partial.append(tail)
                 
-                # specific handling for decoding on Windows might be needed if reconfigure isn't enough
-                try:
-                    line_str = line.decode('utf-8').strip()
-                except UnicodeDecodeError:
-                    try:
-                        line_str = line.decode('cp949').strip()
-                    except:
-                        line_str = line.decode('utf-8', errors='ignore').strip()
-
-                if line_str:
-                    yield line_str
+                if not chunk:
+                    break
+            
+            line = "".join(partial).strip()
+            if line:
+                yield line
                 
             await process.wait()
             
@@ -113,93 +328,324 @@ class GenAudio:
                 yield f"[+] Saved: {output_path.name}"
             else:
                 yield f"[!] Inference failed with exit code {process.returncode}"
+                return
                 
         except Exception as e:
             yield f"[CRITICAL] Subprocess error: {str(e)}"
+            return
+
+    async def _run_ffmpeg_filtergraph(self, file_path: Path, filter_str: str) -> tuple[int, bytes]:
+        """
+        Render file_path through an ffmpeg audio filtergraph in one decode/encode pass.
+        The original is replaced only on success. Returns (returncode, stderr).
+        """
+        temp_out = file_path.with_suffix(".opt" + file_path.suffix)
+        cmd = _ffmpeg_filter_cmd(file_path, temp_out, filter_str)
+        
+        process = await asyncio.create_subprocess_exec(
+            *cmd,
+            stdout=asyncio.subprocess.DEVNULL,
+            stderr=asyncio.subprocess.PIPE
+        )
+        
+        _, stderr = await process.communicate()
+        
+        if process.returncode == 0 and temp_out.exists():
+            temp_out.replace(file_path)
+        else:
+            temp_out.unlink(missing_ok=True)
+        return process.returncode, stderr
+
+    def _vad_fallback_notice(self) -> typing.Optional[str]:
+        """Why Silero VAD could not be loaded (None if there is nothing to report); reported once per instance."""
+        _, reason = _load_vad()
+        if reason is None or self._vad_notice_shown:
+            return None
+        self._vad_notice_shown = True
+        return reason
+
+    async def _vad_trim(self, src: Path, dst: Path) -> typing.Optional[tuple[int, bytes]]:
+        """
+        Trim pauses found by Silero VAD (CUDA only) and write the result to dst.
+        Returns None when VAD is unavailable or src can't be probed, otherwise (returncode, stderr).
+        """
+        model, _ = await asyncio.to_thread(_load_vad)
+        if model is None:
+            return None
+        
+        try:
+            info = sf.info(str(src))
+        except RuntimeError:
+            # libsndfile can't open it (e.g. m4a); ffmpeg silenceremove handles any input
+            return None
+        sr, channels = info.samplerate, info.channels
+        
+        decode = await asyncio.create_subprocess_exec(
+            "ffmpeg", "-v", "error",
+            "-i", str(src),
+            "-f", "s16le", "-ac", str(channels), "-ar", str(sr), "-",
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE
+        )
+        raw, stderr = await decode.communicate()
+        if decode.returncode != 0:
+            return decode.returncode, stderr
+        
+        samples = np.frombuffer(raw, dtype=np.int16).reshape(-1, channels)
+        spans = await asyncio.to_thread(_vad_speech_spans, samples, sr)
+        if not spans:
+            # No speech detected at all; keep the clip rather than emptying it
+            spans = [(0, len(samples))]
+        
+        # Recombine with 200ms silence
+        trimmed = _rejoin_spans(samples, spans, int(sr * 0.2))
+        
+        output_fmt = dst.suffix.lstrip(".")
+        if output_fmt == "wav":
+            # PCM needs no encoder process; write the int16 frames directly
+            await asyncio.to_thread(sf.write, str(dst), trimmed, sr, subtype="PCM_16")
+            return 0, b""
+        
+        encode = await asyncio.create_subprocess_exec(
+            "ffmpeg", "-y", "-v", "error",
+            "-f", "s16le", "-ac", str(channels), "-ar", str(sr), "-i", "pipe:0",
+            "-c:a", "libmp3lame", str(dst),
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.DEVNULL,
+            stderr=asyncio.subprocess.PIPE
+        )
+        _, stderr = await encode.communicate(trimmed.tobytes())
+        return encode.returncode, stderr
 
     async def remove_silence(self, file_path: Path) -> typing.AsyncGenerator[str, None]:
-        """Remove long silence from audio"""
+        """
+        Remove long silence from audio: Silero VAD on GPU when available,
+        otherwise a single ffmpeg silenceremove pass (-45dB threshold)
+        """
         try:
-            from pydub import AudioSegment, silence
-            
-            if file_path.suffix.lower() == ".mp3":
-                audio = AudioSegment.from_mp3(file_path)
+            temp_out = file_path.with_suffix(".opt" + file_path.suffix)
+            result = await self._vad_trim(file_path, temp_out)
+            if result is None:
+                notice = self._vad_fallback_notice()
+                if notice:
+                    yield f"[!] {notice}"
+                returncode, stderr = await self._run_ffmpeg_filtergraph(file_path, SILENCE_FILTER)
             else:
-                audio = AudioSegment.from_file(file_path)
-            
-            # Split on silence > 500ms, -45dB
-            chunks = silence.split_on_silence(
-                audio,
-                min_silence_len=500,
-                silence_thresh=-45,
-                keep_silence=100  # Keep 100ms at edges to avoid clipping
-            )
+                returncode, stderr = result
+                if returncode == 0 and temp_out.exists():
+                    temp_out.replace(file_path)
+                else:
+                    temp_out.unlink(missing_ok=True)
             
-            if chunks:
-                # Recombine with 200ms silence
-                combined = AudioSegment.empty()
-                silence_chunk = AudioSegment.silent(duration=200)
-                
-                for i, chunk in enumerate(chunks):
-                    combined += chunk
-                    if i < len(chunks) - 1:
-                        combined += silence_chunk
-                        
-                combined.export(file_path, format=file_path.suffix.lstrip("."))
+            if returncode == 0:
                 yield f"[+] Silence optimized (trimmed long gaps)"
             else:
-                yield f"[.] No long silences found."
+                yield f"[!] Silence removal failed: {stderr.decode(errors='ignore')}"
                 
         except Exception as e:
             yield f"[!] Silence removal failed: {e}"
 
-    async def normalize_audio(self, file_path: Path) -> typing.AsyncGenerator[str, None]:
-        """Normalize audio to EBU R128 (-14 LUFS)"""
+    async def _measure_loudness(self, file_path: Path) -> tuple[typing.Optional[dict], bytes]:
+        """loudnorm analysis pass (no encode). Returns (measurements, stderr)."""
+        cmd = [
+            "ffmpeg", "-hide_banner", "-nostats",
+            "-i", str(file_path),
+            "-af", f"{LOUDNORM_FILTER}:print_format=json",
+            "-f", "null", "-"
+        ]
+        
+        process = await asyncio.create_subprocess_exec(
+            *cmd,
+            stdout=asyncio.subprocess.DEVNULL,
+            stderr=asyncio.subprocess.PIPE
+        )
+        
+        _, stderr = await process.communicate()
+        
+        if process.returncode != 0:
+            return None, stderr
+        return parse_loudnorm_json(stderr), stderr
+
+    async def _loudnorm_inproc(self, file_path: Path) -> typing.Optional[list[str]]:
+        """
+        Normalize in-process with soundfile + pyloudnorm (one decode, no ffmpeg spawns).
+        Returns None when pyloudnorm is missing or the file can't be handled, otherwise the log lines.
+        """
+        pyln = await asyncio.to_thread(_load_pyloudnorm)
+        if pyln is None:
+            return None
+        
+        temp_out = file_path.with_suffix(".opt" + file_path.suffix)
         try:
-            temp_out = file_path.with_suffix(".norm" + file_path.suffix)
-            output_fmt = file_path.suffix.lstrip(".")
-            codec = "libmp3lame" if output_fmt == "mp3" else "pcm_s16le"
-            
-            norm_cmd = [
-                "ffmpeg-normalize",
-                str(file_path),
-                "-nt", "ebu",
-                "-t", "-14",
-                "-tp", "-1.0",
-                "-o", str(temp_out),
-                "-f", 
-                "-c:a", codec
+            shortfall_db = await asyncio.to_thread(_loudnorm_pcm, pyln, file_path, temp_out)
+        except (RuntimeError, ValueError, TypeError):
+            # Unsupported format for libsndfile, or too short for a loudness block
+            temp_out.unlink(missing_ok=True)
+            return None
+        
+        if shortfall_db is None:
+            return [f"[.] Audio is silent, left untouched."]
+        
+        if abs(shortfall_db) > LOUDNORM_MAX_SHORTFALL_DB:
+            # A single gain can't reach the target under the clamp / true-peak ceiling
+            return [
+                f"[.] Linear gain would land at {LOUDNORM_TARGET_LUFS - shortfall_db:.1f} LUFS, using ffmpeg loudnorm.",
+                *await self._loudnorm_two_pass(file_path),
             ]
-            
-            process = await asyncio.create_subprocess_exec(
-                *norm_cmd,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE
-            )
-            
-            stdout, stderr = await process.communicate()
-            
-            if process.returncode == 0:
-                # Replace original with normalized
-                if temp_out.exists():
-                    temp_out.replace(file_path)
-                yield f"[+] Normalization complete."
-            else:
-                yield f"[!] Normalization failed: {stderr.decode()}"
+        
+        temp_out.replace(file_path)
+        return [f"[+] Normalization complete."]
+
+    async def _loudnorm_two_pass(self, file_path: Path) -> list[str]:
+        """Measure loudness, then render with the measured values. Returns the log lines."""
+        measured, stderr = await self._measure_loudness(file_path)
+        if measured is None:
+            return [f"[!] Normalization failed: {stderr.decode(errors='ignore')}"]
+        
+        if not math.isfinite(float(measured["input_i"])):
+            # Digital silence (or a clip under one 400ms block) has no integrated loudness
+            return [f"[.] No measurable loudness (silent or too short), left untouched."]
+        
+        # loudnorm upsamples to 192kHz internally; resample back to the source rate
+        sample_rate = sf.info(str(file_path)).samplerate
+        filter_str = f"{loudnorm_filter(LOUDNORM_FILTER, measured)},aresample={sample_rate}"
+        returncode, stderr = await self._run_ffmpeg_filtergraph(file_path, filter_str)
+        if returncode != 0:
+            return [f"[!] Normalization failed: {stderr.decode(errors='ignore')}"]
+        return [f"[+] Normalization complete."]
+
+    async def normalize_audio(self, file_path: Path) -> typing.AsyncGenerator[str, None]:
+        """
+        Normalize audio to EBU R128 (-14 LUFS): in-process with pyloudnorm when available,
+        otherwise a two-pass ffmpeg loudnorm
+        """
+        try:
+            logs = await self._loudnorm_inproc(file_path)
+            if logs is None:
+                logs = await self._loudnorm_two_pass(file_path)
+            for log in logs:
+                yield log
                 
         except Exception as e:
             yield f"[!] Normalization error: {e}"
 
+    async def _needs_optimization(self, file_path: Path) -> bool:
+        """
+        Cheap pre-check for optimize_audio: True unless the clip has no long silences,
+        is within 1 LU of -14 LUFS and peaks below -0.5 dBFS.
+        """
+        cmd = [
+            "ffmpeg", "-hide_banner", "-nostats",
+            "-i", str(file_path),
+            "-af", PROBE_FILTER,
+            "-f", "null", "-"
+        ]
+        
+        process = await asyncio.create_subprocess_exec(
+            *cmd,
+            stdout=asyncio.subprocess.DEVNULL,
+            stderr=asyncio.subprocess.PIPE
+        )
+        
+        _, stderr = await process.communicate()
+        
+        if process.returncode != 0:
+            return True
+        
+        log = stderr.decode(errors="ignore")
+        if "silence_start" in log:
+            return True
+        
+        # Summary values (silent audio reports -inf, which does not match)
+        loudness = re.findall(r"\bI:\s+(-?[\d.]+) LUFS", log)
+        peak = re.findall(r"Peak:\s+(-?[\d.]+) dBFS", log)
+        if not loudness or not peak:
+            return True
+        return not (-15.0 <= float(loudness[-1]) <= -13.0 and float(peak[-1]) <= -0.5)
+
+    async def _trim_and_measure(self, file_path: Path, pcm_path: Path) -> tuple[typing.Optional[dict], bytes]:
+        """
+        Decode file_path once: write the silence-trimmed PCM to pcm_path and measure
+        its loudness in the same pass. Returns (measurements, stderr).
+        """
+        cmd = [
+            "ffmpeg", "-y", "-hide_banner", "-nostats",
+            "-i", str(file_path),
+            "-filter_complex",
+            # Explicit resample on the probe branch keeps loudnorm's 192kHz
+            # input requirement from propagating back to the trimmed PCM
+            f"[0:a]{SILENCE_FILTER},asplit=2[trim][probe];"
+            f"[probe]aresample=192000,{LOUDNORM_FILTER}:print_format=json[measure]",
+            "-map", "[trim]", "-c:a", "pcm_s16le", str(pcm_path),
+            "-map", "[measure]", "-f", "null", "-"
+        ]
+        
+        process = await asyncio.create_subprocess_exec(
+            *cmd,
+            stdout=asyncio.subprocess.DEVNULL,
+            stderr=asyncio.subprocess.PIPE
+        )
+        
+        _, stderr = await process.communicate()
+        
+        if process.returncode != 0:
+            return None, stderr
+        return parse_loudnorm_json(stderr), stderr
+
     async def optimize_audio(self, file_path: Path) -> typing.AsyncGenerator[str, None]:
         """
-        Post-process audio:
-        1. Trim long silences
-        2. Normalize audio
+        Post-process audio with one decode and one encode:
+        1. Trim long silences (decoded once to a temporary WAV, measured on the way;
+           Silero VAD decides the pauses when CUDA is available)
+        2. Normalize audio (two-pass loudnorm rendered from the WAV)
         """
         yield f"[*] Optimizing: {file_path.name}"
         
-        async for log in self.remove_silence(file_path):
-            yield f"    {log}"
+        pcm_path = file_path.with_suffix(".trim.wav")
+        try:
+            if not await self._needs_optimization(file_path):
+                yield f"    [.] Already within spec, skipped."
+                return
+            
+            result = await self._vad_trim(file_path, pcm_path)
+            if result is None:
+                notice = self._vad_fallback_notice()
+                if notice:
+                    yield f"    [!] {notice}"
+                measured, stderr = await self._trim_and_measure(file_path, pcm_path)
+            elif result[0] == 0:
+                measured, stderr = await self._measure_loudness(pcm_path)
+            else:
+                measured, stderr = None, result[1]
+            
+            if measured is None:
+                yield f"    [!] Optimization failed: {stderr.decode(errors='ignore')}"
+                return
             
-        async for log in self.normalize_audio(file_path):
-            yield f"    {log}"
+            if not math.isfinite(float(measured["input_i"])):
+                yield f"    [.] Audio is silent, left untouched."
+                return
+            
+            # loudnorm upsamples to 192kHz internally; resample back to the source rate
+            sample_rate = sf.info(str(pcm_path)).samplerate
+            filter_str = f"{loudnorm_filter(LOUDNORM_FILTER, measured)},aresample={sample_rate}"
+            
+            temp_out = file_path.with_suffix(".opt" + file_path.suffix)
+            process = await asyncio.create_subprocess_exec(
+                *_ffmpeg_filter_cmd(pcm_path, temp_out, filter_str),
+                stdout=asyncio.subprocess.DEVNULL,
+                stderr=asyncio.subprocess.PIPE
+            )
+            _, stderr = await process.communicate()
+            
+            if process.returncode == 0 and temp_out.exists():
+                temp_out.replace(file_path)
+                yield f"    [+] Silence trimmed and loudness normalized."
+            else:
+                temp_out.unlink(missing_ok=True)
+                yield f"    [!] Optimization failed: {stderr.decode(errors='ignore')}"
+                
+        except Exception as e:
+            yield f"    [!] Optimization error: {e}"
+        finally:
+            pcm_path.unlink(missing_ok=True)
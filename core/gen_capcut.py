@@ -1,12 +1,87 @@
 
+import os
+import re
+import copy
 import json
+import pickle
+import functools
+import logging
 import uuid
 import shutil
-import glob
+import subprocess
+from datetime import datetime
+from itertools import accumulate, cycle
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, Any, List
 from mutagen import File as MutagenFile
 
+try:
+    import orjson
+except ImportError:
+    orjson = None  # 선택 의존성: 없으면 표준 json 사용
+
+logger = logging.getLogger(__name__)
+
+# 드래프트 폴더에 쓰는 파일 (재생성 시 덮어쓰기 대상)
+DRAFT_FILES = {"draft_content.json", "draft_meta_info.json", "draft_cover.jpg"}
+
+# CJK 통합 한자 범위 (gen_caption._has_kanji와 동일). 요미가나 토큰은 항상 이 범위의 글자를 포함
+_KANJI_RE = re.compile("[\u4e00-\u9fff]")
+
+# mutagen으로 먼저 길이를 읽는 오디오 확장자 (ffprobe 프로세스 생략)
+AUDIO_EXTS = {".mp3", ".wav", ".m4a", ".flac", ".ogg"}
+
+
+# 프로토타입 복제 방식: pickle(기본, 템플릿 프로토타입 기준 json 왕복보다 ~2배 빠름)
+# | json | deepcopy (디버깅용)
+CLONE_BACKEND = os.environ.get("CAPCUT_CLONE_BACKEND", "pickle")
+
+
+def _freeze(proto: Any) -> Any:
+    """프로토타입을 복제용 blob으로 한 번만 변환합니다."""
+    if CLONE_BACKEND == "pickle":
+        return pickle.dumps(proto, protocol=pickle.HIGHEST_PROTOCOL)
+    if CLONE_BACKEND == "deepcopy":
+        return proto
+    return json.dumps(proto)
+
+
+def _thaw(blob: Any) -> Any:
+    """_freeze로 만든 blob에서 독립된 복제본을 만듭니다."""
+    if CLONE_BACKEND == "pickle":
+        return pickle.loads(blob)
+    if CLONE_BACKEND == "deepcopy":
+        return copy.deepcopy(blob)
+    return json.loads(blob)
+
+
+@functools.lru_cache(maxsize=1)
+def _find_drafts_root() -> Path:
+    """
+    CapCut 드래프트 루트를 프로세스당 한 번만 결정하고 준비합니다.
+    경로: %LOCALAPPDATA%/CapCut/User Data/Projects/com.lveditor.draft
+    """
+    local_appdata = os.environ.get("LOCALAPPDATA")
+    if not local_appdata:
+        # 폴백
+        local_appdata = str(Path.home() / "AppData" / "Local")
+        
+    base_dir = Path(local_appdata) / "CapCut" / "User Data" / "Projects" / "com.lveditor.draft"
+    
+    # 베이스 디렉토리가 존재하는지 확인 (사용자가 CapCut을 설치하지 않았을 수 있음)
+    if not base_dir.exists():
+        logger.warning("CapCut draft directory not found at %s", base_dir)
+        # 그래도 생성을 시도해볼까요?
+        base_dir.mkdir(parents=True, exist_ok=True)
+    return base_dir
+
+
+def _loads(raw: bytes) -> Any:
+    """JSON 바이트를 파싱합니다 (orjson이 있으면 사용)."""
+    return orjson.loads(raw) if orjson else json.loads(raw)
+
+
 class CapCutGenerator:
     """
     CapCut 프로젝트 생성기
@@ -20,20 +95,26 @@ class CapCutGenerator:
         template_path = self.templates_dir / "capcut.draft.template.json"
         
         # 디버그 경로 확인
-        print(f"[Debug] Loading Template from: {template_path}")
+        logger.debug("Loading Template from: %s", template_path)
         if not template_path.exists():
-             print(f"[Error] Template file does not exist at {template_path}")
+             logger.error("Template file does not exist at %s", template_path)
         
-        self.draft_template = self._load_json(template_path)
-        print(f"[Debug] Loaded JSON Keys: {list(self.draft_template.keys())}")
-        print(f"[Debug] Tracks Count in Loaded JSON: {len(self.draft_template.get('tracks', []))}")
+        self.draft_template, self._draft_raw = self._load_json(template_path)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Loaded JSON Keys: %s", list(self.draft_template.keys()))
+            logger.debug("Tracks Count in Loaded JSON: %d", len(self.draft_template.get('tracks', [])))
 
-        self.meta_template = self._load_json(self.templates_dir / "capcut.draft.meta.info.json")
+        self.meta_template, self._meta_raw = self._load_json(self.templates_dir / "capcut.draft.meta.info.json")
         
         # 템플릿으로부터 프로젝트 데이터 구조 초기화
-        import copy
-        self.content = copy.deepcopy(self.draft_template) # DEEPCOPY 필수 (원본 보존)
-        self.meta = copy.deepcopy(self.meta_template)
+        self.reset()
+        
+        # 미디어 길이 캐시 (경로 -> [mtime_ns, 크기, 마이크로초]). 재실행 시 ffprobe 생략
+        self._duration_cache_path = self.output_root / ".duration_cache.json"
+        self._duration_cache = self._load_duration_cache()
+        
+        # 텍스트 머티리얼 content 문자열별 파싱된 템플릿
+        self._content_tmpls: Dict[str, Dict] = {}
         
         # 트랙 및 머티리얼 리셋 로직은 생성 단계로 이동됨
         # self.content["tracks"] = [] <--- 제거됨: 프로토타입 유지!
@@ -42,12 +123,41 @@ class CapCutGenerator:
         # self.content["materials"] = { ... } <--- 제거됨
 
         
-    def _load_json(self, path: Path) -> Dict[str, Any]:
-        """JSON 파일을 에러 처리와 함께 로드합니다."""
+    def reset(self):
+        """원본 템플릿 바이트를 다시 파싱하여 프로젝트 데이터를 초기화합니다 (깊은 복제보다 빠름)."""
+        self.content = _loads(self._draft_raw)
+        self.meta = _loads(self._meta_raw)
+        
+        # add_media_tracks가 생성한 오디오 세그먼트 (render_index 순서). 자막 타이밍 기준
+        self.audio_segments_flat: List[Dict] = []
+
+    def _load_json(self, path: Path) -> tuple[Dict[str, Any], bytes]:
+        """JSON 파일을 에러 처리와 함께 로드합니다. (파싱 결과, 원본 바이트) 반환."""
         if not path.exists():
             raise FileNotFoundError(f"Template not found: {path}")
-        with open(path, "r", encoding="utf-8") as f:
-            return json.load(f)
+        with open(path, "rb") as f:
+            raw = f.read()
+        return _loads(raw), raw
+
+    def _load_duration_cache(self) -> Dict[str, list]:
+        """디스크의 미디어 길이 캐시를 로드합니다. 없거나 손상된 경우 빈 캐시."""
+        try:
+            with open(self._duration_cache_path, "r", encoding="utf-8") as f:
+                cache = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        # 이전 형식(경로:mtime:크기 키) 항목은 버림
+        return {k: v for k, v in cache.items() if isinstance(v, list) and len(v) == 3}
+
+    def _save_duration_cache(self):
+        """미디어 길이 캐시를 원자적으로 저장합니다 (임시 파일 -> os.replace)."""
+        tmp_path = self._duration_cache_path.with_suffix(".tmp")
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(self._duration_cache, f)
+            os.replace(tmp_path, self._duration_cache_path)
+        except OSError as e:
+            logger.warning("Could not write duration cache: %s", e)
 
     def generate_id(self) -> str:
         """CapCut 스타일의 대문자 UUID를 생성합니다."""
@@ -102,14 +212,53 @@ class CapCutGenerator:
         except:
             pass
             
-        print(f"Warning: Could not parse time {time_str}")
+        logger.warning("Could not parse time %s", time_str)
         return 0
 
     def _get_media_duration(self, path: Path) -> int:
-        """ffprobe를 사용하여 미디어 길이를 마이크로초 단위로 반환합니다."""
-        import subprocess
+        """미디어 길이를 마이크로초 단위로 반환합니다 (mtime+크기가 같으면 캐시 사용)."""
+        cache_key = str(path)
+        try:
+            stat = path.stat()
+            signature = [stat.st_mtime_ns, stat.st_size]
+        except OSError:
+            signature = None
+        cached = self._duration_cache.get(cache_key)
+        if signature and cached and cached[:2] == signature:
+            return cached[2]
+        
+        if path.suffix.lower() in AUDIO_EXTS:
+            duration = self._get_audio_duration_fast(path)
+        else:
+            duration = self._probe_media_duration(path)
+        if signature and duration > 0:
+            # 경로당 한 항목만 유지 (파일이 바뀌면 덮어써서 캐시가 무한히 커지지 않음)
+            self._duration_cache[cache_key] = signature + [duration]
+        return duration
+
+    def _probe_durations(self, paths: List[Path]) -> Dict[Path, int]:
+        """
+        여러 미디어 파일의 길이를 병렬로 한 번에 조회하고 캐시를 저장합니다.
+        (ffprobe 프로세스 기동 비용이 지배적이므로 스레드 풀로 동시 실행)
+        """
+        with ThreadPoolExecutor(max_workers=os.cpu_count()) as pool:
+            durations = dict(zip(paths, pool.map(self._get_media_duration, paths)))
+        self._save_duration_cache()
+        return durations
+
+    def _probe_media_duration(self, path: Path) -> int:
+        """ffprobe(실패 시 mutagen)로 미디어 길이를 측정합니다."""
+        # 비디오에 더 강력한 ffprobe 먼저 시도
+        # ffprobe 실패 시 mutagen으로 폴백 (주로 오디오용)
+        return self._ffprobe_duration(path) or self._mutagen_duration(path)
+
+    def _get_audio_duration_fast(self, path: Path) -> int:
+        """오디오는 프로세스 없이 mutagen으로 먼저 측정하고, 실패 시에만 ffprobe 사용."""
+        return self._mutagen_duration(path) or self._ffprobe_duration(path)
+
+    def _ffprobe_duration(self, path: Path) -> int:
+        """ffprobe로 미디어 길이(마이크로초)를 측정합니다. 실패 시 0."""
         try:
-            # 비디오에 더 강력한 ffprobe 먼저 시도
             cmd = [
                 'ffprobe', 
                 '-v', 'error', 
@@ -121,75 +270,92 @@ class CapCutGenerator:
             result = subprocess.check_output(cmd, stderr=subprocess.STDOUT).decode().strip()
             return int(float(result) * 1000000)
         except Exception as e:
-            print(f"[Warning] ffprobe failed for {path.name}: {e}")
-            
-        # ffprobe 실패 시 mutagen으로 폴백 (주로 오디오용)
+            logger.warning("ffprobe failed for %s: %s", path.name, e)
+        return 0
+
+    def _mutagen_duration(self, path: Path) -> int:
+        """mutagen(프로세스 내 파서)으로 미디어 길이(마이크로초)를 측정합니다. 실패 시 0."""
         try:
             f = MutagenFile(path)
-            if f and f.info:
+            # 태그 없는 WAVE 객체는 빈 dict처럼 falsy이므로 None과만 비교
+            if f is not None and f.info:
                 return int(f.info.length * 1000000)
         except Exception as e:
-             print(f"[Error] mutagen failed for {path.name}: {e}")
-             
+             logger.error("mutagen failed for %s: %s", path.name, e)
         return 0
 
+    def _scan_files(self, directory: Path, ext: str) -> List[Path]:
+        """os.scandir로 디렉토리에서 확장자가 일치하는 파일을 이름순으로 반환합니다."""
+        try:
+            with os.scandir(directory) as it:
+                # 이름 문자열로 먼저 거르고 정렬한 뒤, 일치하는 항목만 Path로 변환
+                names = sorted(e.name for e in it if e.name.endswith(ext) and e.is_file())
+        except (FileNotFoundError, NotADirectoryError):
+            # 디렉토리가 없으면 빈 목록 (별도 존재 확인 stat 생략)
+            return []
+        return [directory / name for name in names]
+
     def add_media_tracks(self, project_name: str):
         """
         2단계: 프로토타입 복제를 사용하여 비디오 및 오디오 트랙 생성.
         """
+        # 이전 호출의 오디오 세그먼트 초기화 (조기 반환 시 process_subtitles가 오래된 목록을 쓰지 않도록)
+        self.audio_segments_flat = []
+        
         project_dir = self.output_root / project_name
         video_dir = project_dir / "simulated"
         audio_dir = project_dir / "audios" / "ja"
         
         # 1. 파일 스캔 및 정렬
-        videos = sorted(list(video_dir.glob("*.mp4")))
-        audios = sorted(list(audio_dir.glob("*.mp3")))
+        videos = self._scan_files(video_dir, ".mp4")
+        audios = self._scan_files(audio_dir, ".mp3")
         
         if len(videos) != len(audios):
-            print(f"WARNING: Video count ({len(videos)}) != Audio count ({len(audios)})")
+            logger.warning("Video count (%d) != Audio count (%d)", len(videos), len(audios))
             
-        print(f"Found {len(videos)} videos and {len(audios)} audios.")
+        logger.info("Found %d videos and %d audios.", len(videos), len(audios))
         
         # --- 프로토타입 추출 ---
-        import copy
-        
-        # 파일에 디버그 로깅
-        debug_log_path = self.output_root / "gen_debug.txt"
-        with open(debug_log_path, "w", encoding="utf-8") as log:
-            log.write(f"Template Tracks Types: {[t['type'] for t in self.content['tracks']]}\n")
+        # 디버그 로깅 (별도 디버그 파일 쓰기 없이 로거로)
+        logger.debug("Template Tracks Types: %s", [t['type'] for t in self.content['tracks']])
 
-            # 비디오 프로토타입
-            video_mat_proto = self.content["materials"]["videos"][0] if self.content["materials"].get("videos") else None
-            
-            track_video_proto = None
-            for t in self.content["tracks"]:
-                if t["type"] == "video" and t.get("segments"):
-                    track_video_proto = t["segments"][0]
-                    break
-            
-            log.write(f"Video Mat Proto: {bool(video_mat_proto)}\n")
-            log.write(f"Video Track Proto: {bool(track_video_proto)}\n")
+        # 비디오 프로토타입
+        video_mat_proto = self.content["materials"]["videos"][0] if self.content["materials"].get("videos") else None
+        
+        track_video_proto = None
+        for t in self.content["tracks"]:
+            if t["type"] == "video" and t.get("segments"):
+                track_video_proto = t["segments"][0]
+                break
+        
+        logger.debug("Video Mat Proto: %s", bool(video_mat_proto))
+        logger.debug("Video Track Proto: %s", bool(track_video_proto))
 
-            # 오디오 프로토타입
-            audio_mat_proto = self.content["materials"]["audios"][0] if self.content["materials"].get("audios") else None
-            
-            track_audio_proto = None
-            for t in self.content["tracks"]:
-                if t["type"] == "audio" and t.get("segments"):
-                    track_audio_proto = t["segments"][0]
-                    break
-            
-            log.write(f"Audio Mat Proto: {bool(audio_mat_proto)}\n")
-            log.write(f"Audio Track Proto: {bool(track_audio_proto)}\n")
+        # 오디오 프로토타입
+        audio_mat_proto = self.content["materials"]["audios"][0] if self.content["materials"].get("audios") else None
+        
+        track_audio_proto = None
+        for t in self.content["tracks"]:
+            if t["type"] == "audio" and t.get("segments"):
+                track_audio_proto = t["segments"][0]
+                break
+        
+        logger.debug("Audio Mat Proto: %s", bool(audio_mat_proto))
+        logger.debug("Audio Track Proto: %s", bool(track_audio_proto))
 
-            if not video_mat_proto or not track_video_proto:
-                log.write("ERROR: Missing Video Prototypes\n")
-                print("Error: Could not find Video prototypes in template.")
-                return 
+        if not video_mat_proto or not track_video_proto:
+            logger.error("Could not find Video prototypes in template.")
+            return 
 
         # 명확성을 위해 이름 변경
         video_proto = video_mat_proto
         audio_proto = audio_mat_proto
+        
+        # 프로토타입을 한 번만 직렬화 -> 반복마다 blob에서 복제 (트리 순회 생략)
+        video_mat_blob = _freeze(video_proto)
+        video_seg_blob = _freeze(track_video_proto)
+        audio_mat_blob = _freeze(audio_proto) if audio_proto else None
+        audio_seg_blob = _freeze(track_audio_proto) if track_audio_proto else None
 
 
         # --- 기존 내용 삭제 ---
@@ -205,10 +371,10 @@ class CapCutGenerator:
         # 따라서 여기서 비디오/오디오 머티리얼을 정리하고,
         # 기존 비디오/오디오 트랙을 제거합니다.
         
-        self.content["tracks"] = [t for t in self.content["tracks"] if t["type"] not in ["video", "audio"]]
+        self.content["tracks"][:] = [t for t in self.content["tracks"] if t["type"] not in ("video", "audio")]
         
         if not videos:
-             print("Error: No videos found for audio-driven timeline.")
+             logger.error("No videos found for audio-driven timeline.")
              return
 
         # 2. 시퀀스 처리 (오디오 기반)
@@ -219,25 +385,38 @@ class CapCutGenerator:
         # 오디오 개수에 맞춰 진행
         count = len(audios)
         
+        # CapCut용 절대 경로 문자열을 파일당 한 번만 계산
+        video_paths_abs = [str(p.absolute()).replace("\\", "/") for p in videos]
+        audio_paths_abs = [str(p.absolute()).replace("\\", "/") for p in audios]
+        
+        # 미디어 길이를 루프 전에 한 번에 조회
+        # 비디오는 순환 사용되므로 앞에서부터 최대 count개만 쓰임
+        probe_paths = videos[:count]
+        if audio_proto and track_audio_proto:
+            probe_paths += audios
+        durations = self._probe_durations(probe_paths)
+        
+        # 비디오가 오디오보다 적으면 재활용 (경로와 절대 경로 문자열을 함께 순환)
+        video_cycle = cycle(zip(videos, video_paths_abs))
+        
         for i in range(count):
             aud_path = audios[i]
-            # 비디오가 오디오보다 적으면 재활용
-            vid_path = videos[i % len(videos)]
+            vid_path, vid_path_abs = next(video_cycle)
             
             # --- 오디오 처리 ---
             if audio_proto and track_audio_proto:
-                aud_duration = self._get_media_duration(aud_path)
+                aud_duration = durations[aud_path]
                 aud_material_id = self.generate_id()
                 
                 # 머티리얼 복제
-                m_aud = copy.deepcopy(audio_proto)
+                m_aud = _thaw(audio_mat_blob)
                 m_aud["id"] = aud_material_id
-                m_aud["path"] = str(aud_path.absolute()).replace("\\", "/")
+                m_aud["path"] = audio_paths_abs[i]
                 m_aud["duration"] = aud_duration
                 self.content["materials"]["audios"].append(m_aud)
                 
                 # 세그먼트 복제
-                s_aud = copy.deepcopy(track_audio_proto)
+                s_aud = _thaw(audio_seg_blob)
                 s_aud["id"] = self.generate_id()
                 s_aud["material_id"] = aud_material_id
                 s_aud["source_timerange"] = {"start": 0, "duration": aud_duration}
@@ -253,18 +432,18 @@ class CapCutGenerator:
             # 전체 비디오 파일을 사용하거나, 오디오보다 길면 자름.
             # 비디오가 오디오보다 짧으면 CapCut이 마지막 프레임을 정지시킬 수 있음.
             
-            vid_file_dur = self._get_media_duration(vid_path)
+            vid_file_dur = durations[vid_path]
             vid_material_id = self.generate_id()
             
             # 머티리얼 복제
-            m_vid = copy.deepcopy(video_proto)
+            m_vid = _thaw(video_mat_blob)
             m_vid["id"] = vid_material_id
-            m_vid["path"] = str(vid_path.absolute()).replace("\\", "/")
+            m_vid["path"] = vid_path_abs
             m_vid["duration"] = vid_file_dur
             self.content["materials"]["videos"].append(m_vid)
             
             # 세그먼트 복제
-            s_vid = copy.deepcopy(track_video_proto)
+            s_vid = _thaw(video_seg_blob)
             s_vid["id"] = self.generate_id()
             s_vid["material_id"] = vid_material_id
             
@@ -301,46 +480,43 @@ class CapCutGenerator:
         
         # 총 지속 시간 업데이트
         self.content["duration"] = current_time_us
+        
+        # 자막 단계용: 생성 순서가 곧 render_index 순서이므로 정렬 불필요
+        self.audio_segments_flat = new_audio_segments
 
-    def _split_text(self, text: str) -> List[str]:
-        """텍스트를 최대 16글자씩 분할하여 리스트로 반환합니다."""
-        # 이미 개행문자가 있는지 확인 (수동 줄바꿈)
-        if '\n' in text:
-            # Re-split long lines? Or respect manual? 
-            # 일단 입력이 자동 줄바꿈이 필요하다고 가정.
-            text = text.replace('\n', '')
-            
+    def _split_text_clean(self, text: str) -> tuple[List[str], str]:
+        """
+        줄바꿈이 이미 제거된 텍스트를 최대 16글자씩 분할합니다.
+        (줄 리스트, 줄바꿈이 삽입된 최종 텍스트) 반환. 한 줄이면 원본을 그대로 사용.
+        """
         if len(text) <= 16:
-            return [text]
-        lines = []
-        current = ""
-        for char in text:
-            if len(current) < 16:
-                current += char
-            else:
-                lines.append(current)
-                current = char
-        if current:
-            lines.append(current)
-        return lines
+            # 대부분의 자막: 분할/결합 생략 (빈 문자열도 한 줄로 유지)
+            return [text], text
+        lines = [text[i:i + 16] for i in range(0, len(text), 16)]
+        return lines, "\n".join(lines)
 
     def _map_yomigana(self, text: str, kanjis: List[Dict]) -> Dict[int, tuple]:
         """텍스트의 문자 인덱스를 (요미가나, 원본 길이, 칸지 인덱스) 튜플로 매핑합니다."""
+        # 빠른 종료: 요미가나 항목이 없거나 텍스트에 한자가 없으면 매칭될 토큰이 없음
+        if not kanjis or not _KANJI_RE.search(text):
+            return {}
+        
         mapping = {}
-        k_ptr = 0
         t_ptr = 0
-        while t_ptr < len(text) and k_ptr < len(kanjis):
-            target = kanjis[k_ptr]['kanji']
-            try:
-                found_idx = text.index(target, t_ptr)
-                # 텍스트, 원본 길이, 그리고 kanjis 배열 내 인덱스를 함께 저장
-                mapping[found_idx] = (kanjis[k_ptr]['yomigana'], len(target), k_ptr)
-                t_ptr = found_idx + 1 # 계속 스캔하기 위해 첫 글자 다음으로 이동
-                # 이중 매칭 방지를 위해 토큰 길이만큼 건너뜀
-                t_ptr = found_idx + len(target)
-                k_ptr += 1
-            except ValueError:
-                k_ptr += 1
+        text_len = len(text)
+        # 딕셔너리 조회를 한 번씩만 하도록 (칸지, 요미가나) 쌍을 미리 추출
+        kanji_list = [(k['kanji'], k['yomigana']) for k in kanjis]
+        for k_idx, (target, yomigana) in enumerate(kanji_list):
+            if t_ptr >= text_len:
+                break
+            # 예외 대신 -1 반환으로 분기 (try/except 비용 제거)
+            found_idx = text.find(target, t_ptr)
+            if found_idx == -1:
+                continue
+            # 텍스트, 원본 길이, 그리고 kanjis 배열 내 인덱스를 함께 저장
+            mapping[found_idx] = (yomigana, len(target), k_idx)
+            # 이중 매칭 방지를 위해 토큰 길이만큼 건너뜀
+            t_ptr = found_idx + len(target)
         return mapping
 
 
@@ -352,20 +528,19 @@ class CapCutGenerator:
         """
         sub_path = self.output_root / project_name / "subtitles" / "synced" / "ja.json"
         if not sub_path.exists():
-            print(f"No subtitle file found at {sub_path}")
+            logger.warning("No subtitle file found at %s", sub_path)
             return
 
-        with open(sub_path, "r", encoding="utf-8") as f:
-            subtitles = json.load(f)
+        # 바이너리로 읽어 orjson(있으면)으로 파싱 (텍스트 디코딩 단계 생략)
+        with open(sub_path, "rb") as f:
+            subtitles = _loads(f.read())
 
         # --- PROTOTYPE EXTRACTION (TEXT) ---
-        import copy
-        
         text_mats = self.content["materials"].get("texts", [])
         text_tracks = [t for t in self.content["tracks"] if t["type"] == "text" and t.get("segments")]
         
         if not text_tracks:
-            print("Error: No text tracks found in template for prototyping.")
+            logger.error("No text tracks found in template for prototyping.")
             return
 
         # Main Prototype
@@ -378,18 +553,29 @@ class CapCutGenerator:
         proto_ruby_seg = text_tracks[1]["segments"][0] if has_ruby_proto else proto_main_seg
 
         if not proto_main_mat or not proto_main_seg:
-             print("Error: Could not extract Main Text prototype.")
+             logger.error("Could not extract Main Text prototype.")
              return
 
+        # 프로토타입을 한 번만 직렬화 (자막마다 blob에서 독립된 복제본 생성)
+        # 세그먼트도 복제본을 써야 세그먼트끼리 clip/timerange 등 하위 객체를 공유하지 않음
+        # 루비 프로토타입이 없으면 메인과 같은 객체 -> blob도 하나만 만들어 공유
+        main_mat_blob = _freeze(proto_main_mat)
+        main_seg_blob = _freeze(proto_main_seg)
+        self._proto_blobs = {
+            "main_mat": main_mat_blob,
+            "main_seg": main_seg_blob,
+            "ruby_mat": main_mat_blob if proto_ruby_mat is proto_main_mat else _freeze(proto_ruby_mat),
+            "ruby_seg": main_seg_blob if proto_ruby_seg is proto_main_seg else _freeze(proto_ruby_seg),
+        }
+
         # --- CLEAR EXISTING TEXT ---
         self.content["materials"]["texts"] = []
-        self.content["tracks"] = [t for t in self.content["tracks"] if t["type"] != "text"]
+        self.content["tracks"][:] = [t for t in self.content["tracks"] if t["type"] != "text"]
 
         new_main_segments = []
-        # 요미가나를 칸지 인덱스(k_ptr)별로 분리하여 관리
-        # 예: ruby_segments_by_idx[0] = [모든 자막의 첫 번째 한자 요미가나들]
-        from collections import defaultdict
-        ruby_segments_by_idx = defaultdict(list)
+        # 요미가나를 칸지 인덱스(k_ptr)별 트랙으로 분리하여 관리 (처음 등장 시 트랙 생성)
+        # 예: ruby_tracks[0] = 모든 자막의 첫 번째 한자 요미가나 트랙
+        ruby_tracks: Dict[int, Dict] = {}
         
         seg_counter = 0
 
@@ -405,6 +591,13 @@ class CapCutGenerator:
 
         num_subs = len(subtitles)
         
+        # add_media_tracks가 같은 세션에서 실행되지 않은 경우에만 트랙을 스캔 (render_index 정렬)
+        if not self.audio_segments_flat:
+            self.audio_segments_flat = sorted(
+                (seg for t in self.content["tracks"] if t["type"] == "audio" for seg in t.get("segments", [])),
+                key=lambda x: x.get("render_index", 0)
+            )
+        
         for i, sub in enumerate(subtitles):
             raw_text = sub.get("text", "")
             kanjis = sub.get("kanjis", [])
@@ -418,16 +611,7 @@ class CapCutGenerator:
             # 여기서는 "audio" 타입 트랙의 세그먼트들을 평탄화해서 가져오거나, 
             # 단순히 순서대로 매칭합니다. (1 Sub = 1 Audio File 가정)
             
-            # 오디오 세그먼트 리스트 캐싱 (루프 밖에서 해야 효율적이지만, 안전하게 여기서 찾음)
-            if i == 0:
-                self.audio_segments_flat = []
-                for t in self.content["tracks"]:
-                    if t["type"] == "audio":
-                         self.audio_segments_flat.extend(t.get("segments", []))
-                
-                # 오디오 세그먼트 정렬 (render_index 기준)
-                self.audio_segments_flat.sort(key=lambda x: x.get("render_index", 0))
-
+            # 오디오 세그먼트 리스트는 add_media_tracks에서 render_index 순서로 저장됨
             if i < len(self.audio_segments_flat):
                 # 오디오 기준 타이밍 강제 적용
                 aud_seg = self.audio_segments_flat[i]
@@ -437,7 +621,7 @@ class CapCutGenerator:
             else:
                 # 오디오가 부족한 경우 (예외 처리)
                 # 기존 로직 폴백 혹은 건너뛰기
-                print(f"Warning: No audio segment found for subtitle {i}. Skipping.")
+                logger.warning("No audio segment found for subtitle %d. Skipping.", i)
                 continue
 
             # 로직: Gap Filling, Overlap 방지 등은 오디오 트랙이 이미 처리되었으므로 불필요.
@@ -459,21 +643,30 @@ class CapCutGenerator:
             yomi_map = self._map_yomigana(clean_text, kanjis)
             
             # 포맷팅 적용 (16자 초과 시 분할)
-            # _split_text는 이제 clean_text를 받음
-            lines = self._split_text(clean_text) 
-            final_text = "\n".join(lines)
+            # clean_text는 이미 줄바꿈이 제거되었으므로 다시 스캔하지 않음
+            lines, final_text = self._split_text_clean(clean_text)
+            
+            # 메인 자막과 이 자막의 모든 요미가나가 같은 시간 범위 (세그먼트마다 복사해서 사용)
+            timeranges = {
+                "target_timerange": {"start": start_us, "duration": duration_us},
+                "source_timerange": {"start": 0, "duration": duration_us}
+            }
             
             # --- 메인 자막 ---
             self._add_text_segment_clone(
                 new_main_segments, 
-                proto_main_mat, 
-                proto_main_seg, 
+                self._proto_blobs["main_mat"], 
+                self._proto_blobs["main_seg"], 
                 final_text, 
-                start_us, 
-                duration_us, 
+                timeranges, 
                 seg_counter
             )
             
+            # 요미가나가 없는 자막은 배치 계산 전체를 건너뜀
+            if not yomi_map:
+                seg_counter += 1
+                continue
+            
             # --- 요미가나 ---
             CHAR_WIDTH = 0.035
             # 줄 간격 조정 - 사용자 피드백 "너무 좁다". 0.155로 증가.
@@ -506,64 +699,72 @@ class CapCutGenerator:
             
             char_offset_global = 0 
             
+            # 요미가나 항목 (_map_yomigana가 오프셋 오름차순으로 생성) -> 줄 단위로 소비
+            yomi_items = list(yomi_map.items())
+            yomi_ptr = 0
+            
             # 폰트 크기/스케일에 따른 표준 너비
             FULL_WIDTH = 0.0580 # 한자 기본 너비 (우측 밀림 방지를 위해 0.035에서 축소)
             HALF_WIDTH = 0.0290 # ASCII/공백용
             
-            def get_char_width(c):
-                 # 단순 휴리스틱: ord(c) < 128 (ASCII) -> 절반 너비
-                 # 반각 카나도 체크해야 할까? 현재는 ASCII만.
-                 return HALF_WIDTH if ord(c) < 128 else FULL_WIDTH
-
             for line_idx, line in enumerate(lines):
                 line_len = len(line)
+                line_end = char_offset_global + line_len
                 
                 # 아래로 쌓기: 다음 줄은 높이를 뺌(-)
                 base_y = start_y - (line_idx * LINE_HEIGHT)
                 
+                # 글자별 너비를 한 번만 계산 (레이아웃과 그룹 너비에서 재사용)
+                # 단순 휴리스틱: ASCII (c < '\x80', ord() 호출 없이 문자 비교) -> 절반 너비
+                # 반각 카나도 체크해야 할까? 현재는 ASCII만.
+                widths = [HALF_WIDTH if c < '\x80' else FULL_WIDTH for c in line]
+                # 누적 너비: prefix[j] = line[:j]의 너비 (그룹 너비를 O(1)로 계산)
+                prefix = list(accumulate(widths, initial=0))
+                
                 # 라인의 총 시각적 너비 계산
-                total_visual_width = sum(get_char_width(c) for c in line)
+                total_visual_width = prefix[-1]
                 
                 # 라인 중심을 기준으로 각 글자의 중심 위치가 필요함.
                 # 시작 X (왼쪽) = 0.5 - (총 너비 / 2)
+                line_x = 0.5 - (total_visual_width / 2)
                 
-                current_x = 0.5 - (total_visual_width / 2)
+                # 루비 Y는 줄마다 고정
+                ruby_y = base_y - RUBY_Y_OFFSET
                 
-                for char_i, char in enumerate(line):
-                    cw = get_char_width(char)
-                    center_pos = current_x + (cw / 2)
+                # 글자 단위로 돌지 않고 이 줄에 걸린 요미가나만 처리
+                while yomi_ptr < len(yomi_items) and yomi_items[yomi_ptr][0] < line_end:
+                    offset, (ruby_text, span_len, k_idx) = yomi_items[yomi_ptr]
+                    yomi_ptr += 1
+                    char_i = offset - char_offset_global
+                    
+                    # 그룹 범위: char_i ... char_i + span_len - 1 ("순서 이상함" 버그 수정)
+                    # 범위 체크 (단어가 줄바꿈에 걸리면 범위 자름)
+                    safe_span = min(span_len, line_len - char_i)
+                    
+                    # 그룹의 중심 = 줄 시작 X + 그룹 양 끝 누적 너비의 평균
+                    center_x = line_x + (prefix[char_i] + prefix[char_i + safe_span]) / 2
                     
-                    if char_offset_global in yomi_map:
-                        # 튜플 언패킹 업데이트: (text, span_len, k_idx)
-                        ruby_text, span_len, k_idx = yomi_map[char_offset_global]
-                        
-                        # 그룹 너비 계산 ("순서 이상함" 버그 수정)
-                        # char_i ... char_i + span_len - 1 까지의 너비 필요
-                        # 범위 체크 (단어가 줄바꿈에 걸리면 범위 자름)
-                        safe_span = min(span_len, line_len - char_i)
-                        
-                        group_width = 0
-                        for k in range(safe_span):
-                             group_width += get_char_width(line[char_i + k])
-                        
-                        # 그룹의 중심 = 현재 X + (그룹 너비 / 2)
-                        center_x = current_x + (group_width / 2)
-                        ruby_y = base_y - RUBY_Y_OFFSET
-                        
-                        self._add_ruby_segment_clone(
-                            ruby_segments_by_idx[k_idx], # 해당 인덱스의 리스트에 추가
-                            proto_ruby_mat,
-                            proto_ruby_seg,
-                            ruby_text,
-                            start_us, 
-                            duration_us,
-                            center_x,
-                            ruby_y,
-                            seg_counter
-                        )
+                    ruby_track = ruby_tracks.get(k_idx)
+                    if ruby_track is None:
+                        ruby_track = ruby_tracks[k_idx] = {
+                            "id": self.generate_id(),
+                            "type": "text",
+                            "attribute": 0,
+                            "segments": []
+                        }
                     
-                    current_x += cw
-                    char_offset_global += 1
+                    self._add_ruby_segment_clone(
+                        ruby_track["segments"], # 해당 인덱스의 트랙에 직접 추가
+                        self._proto_blobs["ruby_mat"],
+                        self._proto_blobs["ruby_seg"],
+                        ruby_text,
+                        timeranges,
+                        center_x,
+                        ruby_y,
+                        seg_counter
+                    )
+                    
+                char_offset_global = line_end
                     
             seg_counter += 1
 
@@ -576,38 +777,28 @@ class CapCutGenerator:
                 "segments": new_main_segments
             })
             
-        # 요미가나 트랙 생성: 인덱스 순서대로 별도의 트랙 생성
+        # 요미가나 트랙 추가: 인덱스 순서대로 (첫 등장 순서는 자막에 따라 단조롭지 않을 수 있음)
         # kanjis[0] -> Track 4, kanjis[1] -> Track 5 ...
-        sorted_indices = sorted(ruby_segments_by_idx.keys())
-        for idx in sorted_indices:
-             segments = ruby_segments_by_idx[idx]
-             if segments:
-                self.content["tracks"].append({
-                    "id": self.generate_id(),
-                    "type": "text",
-                    "attribute": 0,
-                    "segments": segments
-                })
-
-    def _create_text_material(self, proto: Dict, text: str, scale: float = 1.0, is_ruby: bool = False) -> Dict:
-        """클론에서 콘텐츠 텍스트 및 스타일을 업데이트합니다."""
-        import copy
-        m = copy.deepcopy(proto)
+        self.content["tracks"].extend(ruby_tracks[idx] for idx in sorted(ruby_tracks))
+
+    def _create_text_material(self, proto_blob: Any, text: str, scale: float = 1.0, is_ruby: bool = False) -> Dict:
+        """직렬화된 프로토타입을 복제하여 콘텐츠 텍스트 및 스타일을 업데이트합니다."""
+        m = _thaw(proto_blob)
         m["id"] = self.generate_id()
         
         try:
-            content = json.loads(m["content"])
-            content["text"] = text
+            # 콘텐츠 템플릿은 프로토타입당 한 번만 파싱하고, 텍스트와 범위만 교체
+            tmpl = self._content_tmpls.get(m["content"])
+            if tmpl is None:
+                tmpl = self._content_tmpls[m["content"]] = json.loads(m["content"])
+            content = {**tmpl, "text": text}
             
             # 스타일 규칙 적용
-            styles = content.get("styles", [])
+            styles = tmpl.get("styles", [])
             if styles:
                 # 새 텍스트 길이를 커버하도록 범위 업데이트
-                for s in styles:
-                    s["range"] = [0, len(text)]
-                    
-                    # 필요시 폰트 크기 일관성 유지 (5.0), 혹은 프로토타입 신뢰
-                    # s["size"] = 5.0 
+                # 필요시 폰트 크기 일관성 유지 (5.0), 혹은 프로토타입 신뢰
+                content["styles"] = [{**s, "range": [0, len(text)]} for s in styles]
                 
             m["content"] = json.dumps(content, ensure_ascii=False)
             
@@ -616,68 +807,65 @@ class CapCutGenerator:
             # 줄 간격 오버라이드 제거
             
         except Exception as e:
-            print(f"Error parsing text content: {e}")
+            logger.error("Error parsing text content: %s", e)
             
         return m
 
-    def _add_text_segment_clone(self, target_list: List, proto_mat: Dict, proto_seg: Dict, 
-                               text: str, start_us: int, duration_us: int, render_index: int):
-        import copy
+    def _add_text_segment_clone(self, target_list: List, proto_mat: Any, proto_seg: Any, 
+                               text: str, timeranges: Dict, render_index: int):
         # Create Material
         new_mat = self._create_text_material(proto_mat, text, is_ruby=False)
         self.content["materials"]["texts"].append(new_mat)
         
-        # Create Segment
-        s = copy.deepcopy(proto_seg)
+        # Create Segment (blob에서 복제: 다른 세그먼트와 공유하는 하위 객체 없음)
+        s = _thaw(proto_seg)
         s["id"] = self.generate_id()
         s["material_id"] = new_mat["id"]
-        s["target_timerange"] = {"start": start_us, "duration": duration_us}
-        s["source_timerange"] = {"start": 0, "duration": duration_us}
+        s["target_timerange"] = dict(timeranges["target_timerange"])
+        s["source_timerange"] = dict(timeranges["source_timerange"])
         s["render_index"] = render_index
         
-        if "clip" not in s: s["clip"] = {}
-        if "transform" not in s["clip"]: s["clip"]["transform"] = {}
-        if "scale" not in s["clip"]: s["clip"]["scale"] = {}
-        
         # Coords (Main)
-        s["clip"]["transform"]["x"] = 0.5052
-        s["clip"]["transform"]["y"] = 0.6944
-        s["clip"]["scale"] = {"x": 1.0, "y": 1.0}
+        clip = s.setdefault("clip", {})
+        clip.setdefault("transform", {}).update(x=0.5052, y=0.6944)
+        clip["scale"] = {"x": 1.0, "y": 1.0}
         
         target_list.append(s)
 
-    def _add_ruby_segment_clone(self, target_list: List, proto_mat: Dict, proto_seg: Dict,
-                               text: str, start_us: int, duration_us: int, 
+    def _add_ruby_segment_clone(self, target_list: List, proto_mat: Any, proto_seg: Any,
+                               text: str, timeranges: Dict, 
                                x: float, y: float, render_index: int):
-        import copy
         # Create Material
         new_mat = self._create_text_material(proto_mat, text, is_ruby=True)
         self.content["materials"]["texts"].append(new_mat)
         
-        # Create Segment
-        s = copy.deepcopy(proto_seg)
+        # Create Segment (blob에서 복제: 다른 세그먼트와 공유하는 하위 객체 없음)
+        s = _thaw(proto_seg)
         s["id"] = self.generate_id()
         s["material_id"] = new_mat["id"]
-        s["target_timerange"] = {"start": start_us, "duration": duration_us}
-        s["source_timerange"] = {"start": 0, "duration": duration_us}
+        s["target_timerange"] = dict(timeranges["target_timerange"])
+        s["source_timerange"] = dict(timeranges["source_timerange"])
         s["render_index"] = render_index
         
-        if "clip" not in s: s["clip"] = {}
-        if "transform" not in s["clip"]: s["clip"]["transform"] = {}
-        if "scale" not in s["clip"]: s["clip"]["scale"] = {}
-        
         # Coords (Ruby)
-        s["clip"]["transform"]["x"] = x
-        s["clip"]["transform"]["y"] = y
-        s["clip"]["scale"] = {"x": 0.6, "y": 0.6}
+        clip = s.setdefault("clip", {})
+        clip.setdefault("transform", {}).update(x=x, y=y)
+        clip["scale"] = {"x": 0.6, "y": 0.6}
         
         target_list.append(s)
     
-    def _write_project_files(self, draft_dir: Path, project_name: str):
+    def _write_project_files(self, draft_dir: Path, project_name: str, pretty: bool = False):
         """프로젝트 파일을 특정 디렉토리에 쓰는 내부 헬퍼 함수."""
-        if draft_dir.exists():
-            shutil.rmtree(draft_dir)
+        # 디렉토리를 통째로 지우지 않고 알려진 파일은 덮어쓰기, 그 외 잔여물만 제거
         draft_dir.mkdir(parents=True, exist_ok=True)
+        with os.scandir(draft_dir) as it:
+            for entry in it:
+                if entry.name in DRAFT_FILES:
+                    continue
+                if entry.is_dir(follow_symlinks=False):
+                    shutil.rmtree(entry.path)
+                else:
+                    os.remove(entry.path)
 
         # 메타 정보 업데이트
         # CapCut은 메타 정보에 절대 경로를 기대할까요? 
@@ -690,35 +878,44 @@ class CapCutGenerator:
         self.meta["draft_fold_path"] = str(draft_dir).replace("\\", "/")
         self.meta["tm_duration"] = self.content.get("duration", 0)
         
-        # 파일 쓰기
-        self._write_json(draft_dir / "draft_content.json", self.content)
-        self._write_json(draft_dir / "draft_meta_info.json", self.meta)
-        
-        # 커버 복사 (옵션)
+        # 파일 쓰기 (서로 독립적인 IO이므로 병렬 처리)
         cover_src = self.templates_dir / "draft_cover.jpg"
-        if cover_src.exists():
-            shutil.copy(cover_src, draft_dir / "draft_cover.jpg")
+        cover_dst = draft_dir / "draft_cover.jpg"
+        with ThreadPoolExecutor(max_workers=3) as pool:
+            futures = [
+                pool.submit(self._write_json, draft_dir / "draft_content.json", self.content, pretty),
+                pool.submit(self._write_json, draft_dir / "draft_meta_info.json", self.meta, pretty),
+                # 커버 복사 (옵션). 변경된 경우에만 복사
+                pool.submit(self._sync_file, cover_src, cover_dst) if cover_src.exists()
+                else pool.submit(cover_dst.unlink, missing_ok=True),
+            ]
+            # 예외 전파
+            for future in futures:
+                future.result()
+
+    def _sync_file(self, src: Path, dst: Path):
+        """크기와 mtime이 다를 때만 파일을 복사합니다 (copy2로 mtime 보존 -> 다음 비교에 사용)."""
+        src_stat = src.stat()
+        try:
+            dst_stat = dst.stat()
+            if dst_stat.st_size == src_stat.st_size and dst_stat.st_mtime_ns == src_stat.st_mtime_ns:
+                return
+        except FileNotFoundError:
+            pass
+        shutil.copy2(src, dst)
 
-    def save_project(self, project_name: str) -> Path:
+    def save_project(self, project_name: str, pretty: bool = False) -> Path:
         """기본 출력 디렉토리 workspace/{project_name}/capcut_draft 에 저장"""
         draft_dir = self.output_root / project_name / "capcut_draft"
-        self._write_project_files(draft_dir, project_name)
+        self._write_project_files(draft_dir, project_name, pretty)
         return draft_dir
 
-    def export_to_capcut(self, project_name: str) -> Path:
+    def export_to_capcut(self, project_name: str, pretty: bool = False) -> Path:
         """
         CapCut 로컬 데이터 폴더로 직접 내보냅니다.
         경로: %LOCALAPPDATA%/CapCut/User Data/Projects/com.lveditor.draft/{project_name}_{timestamp}
         """
-        import os
-        from datetime import datetime
-        
-        local_appdata = os.environ.get("LOCALAPPDATA")
-        if not local_appdata:
-            # 폴백
-            local_appdata = str(Path.home() / "AppData" / "Local")
-            
-        base_dir = Path(local_appdata) / "CapCut" / "User Data" / "Projects" / "com.lveditor.draft"
+        base_dir = _find_drafts_root()
         
         # 타임스탬프가 포함된 폴더명 생성: 예: project_20231226_1830
         timestamp = datetime.now().strftime("%Y%m%d_%H%M")
@@ -726,24 +923,32 @@ class CapCutGenerator:
         
         draft_dir = base_dir / folder_name
         
-        # 베이스 디렉토리가 존재하는지 확인 (사용자가 CapCut을 설치하지 않았을 수 있음)
-        if not base_dir.exists():
-            print(f"Warning: CapCut draft directory not found at {base_dir}")
-            # 그래도 생성을 시도해볼까요?
-            base_dir.mkdir(parents=True, exist_ok=True)
-            
-        print(f"Exporting to CapCut Native Path: {draft_dir}")
+        logger.info("Exporting to CapCut Native Path: %s", draft_dir)
         
-        self._write_project_files(draft_dir, folder_name) # CapCut 목록 혼란 방지를 위해 폴더명을 드래프트 이름으로 사용
+        self._write_project_files(draft_dir, folder_name, pretty) # CapCut 목록 혼란 방지를 위해 폴더명을 드래프트 이름으로 사용
         return draft_dir
 
-    def _write_json(self, path: Path, data: Dict[str, Any]):
-        """JSON 파일을 씁니다."""
+    def _write_json(self, path: Path, data: Dict[str, Any], pretty: bool = False):
+        """
+        JSON 파일을 씁니다 (orjson이 있으면 사용).
+        CapCut은 들여쓰기가 필요 없으므로 기본은 한 줄로 압축. pretty=True는 디버깅용.
+        """
+        if orjson:
+            option = orjson.OPT_NON_STR_KEYS
+            if pretty:
+                option |= orjson.OPT_INDENT_2
+            with open(path, "wb") as f:
+                f.write(orjson.dumps(data, option=option))
+            return
         with open(path, "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=4, ensure_ascii=False)
+            if pretty:
+                json.dump(data, f, indent=4, ensure_ascii=False)
+            else:
+                json.dump(data, f, separators=(",", ":"), ensure_ascii=False)
 
 if __name__ == "__main__":
     # 테스트 스텁
+    logging.basicConfig(level=logging.DEBUG)
     print("Testing CapCutGenerator Step 3...")
     root = Path(__file__).parent.parent / "workspace"
     generator = CapCutGenerator(root)
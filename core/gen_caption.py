@@ -1,38 +1,196 @@
 import os
+import re
 import sys
+import math
 
 import json
 import yaml
-import time
+import asyncio
+import hashlib
+import importlib.util
+import tempfile
+import functools
+import logging
 import typing_extensions as typing
 import warnings
 
 # Suppress Google Generative AI deprecation warning (though we are migrating)
 warnings.filterwarnings("ignore", category=FutureWarning, module="google.generativeai")
-from google import genai
-from google.genai import types
 import shutil
 import subprocess
 from pathlib import Path
-from dotenv import load_dotenv
 
-# Optional import for Sudachi (lazy load in method if needed)
+from core.audio_utils import parse_loudnorm_json, loudnorm_filter, apply_loudness_gain
+
+# Heavy/optional modules (google-genai, dotenv, tokenizers, diskcache, numpy/scipy,
+# pyloudnorm) are imported where first needed, so importing core stays cheap
+if typing.TYPE_CHECKING:
+    from google.genai import types
+
+# Optional fast JSON (falls back to the standard json module)
 try:
-    from sudachipy import tokenizer, dictionary
-    SUDACHI_AVAILABLE = True
+    import orjson
 except ImportError:
-    SUDACHI_AVAILABLE = False
-
-# Robust .env loading
-env_path = Path(__file__).resolve().parent.parent / ".env"
-print(f"[*] Looking for .env at: {env_path}")
-if env_path.exists():
-    load_dotenv(env_path)
-    print(f"[*] Loaded .env from specific path.")
-else:
-    print(f"[!] .env not found at specific path, trying default search...")
-    load_dotenv()
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+
+@functools.lru_cache(maxsize=None)
+def _load_env():
+    """
+    Robust .env loading (project root first, then dotenv's default search), once per
+    process. Variables already set in the environment take precedence.
+    """
+    from dotenv import load_dotenv
+
+    env_path = Path(__file__).resolve().parent.parent / ".env"
+    if env_path.exists():
+        load_dotenv(env_path)
+        logger.info("Loaded .env from %s", env_path)
+    else:
+        logger.info(".env not found at %s, trying default search", env_path)
+        load_dotenv()
+
+# Gemini batch mode (GEMINI_BATCH_MODE): ~50% cheaper, but jobs are queued
+# (minutes to hours), so it is opt-in for non-interactive runs
+BATCH_DONE_STATES = {"JOB_STATE_SUCCEEDED", "JOB_STATE_FAILED", "JOB_STATE_CANCELLED", "JOB_STATE_EXPIRED"}
+
+# Caption preprocessing loudness target
+CAPTION_LOUDNORM = "loudnorm=I=-16:LRA=11:TP=-1.5"
+CAPTION_TARGET_LUFS = -16.0
+CAPTION_PEAK_CEILING = 10 ** (-1.5 / 20)
+# Below this length the ffmpeg spawn/decode overhead outweighs the DSP; normalize in-process
+INPROC_LOUDNORM_MAX_SEC = 120
+# In-process gain that the clamp/true-peak ceiling would leave further than this (dB)
+# from the target goes through ffmpeg loudnorm instead, which limits peaks to reach it
+INPROC_LOUDNORM_MAX_SHORTFALL_DB = 0.5
+
+# Vocal isolation before transcription: "demucs" (best, slow on CPU), "highpass" (numpy/scipy) or "none"
+VOCAL_ISOLATION_MODES = ("demucs", "highpass", "none")
+HIGHPASS_CUTOFF_HZ = 80
+NOISE_GATE_FRAME_SEC = 0.02
+NOISE_GATE_DB = -45.0
+
+# Inline prompts of the caption pipeline (module-level so _pipeline_key can hash them).
+# Indentation is part of the text: cached responses are keyed by the exact prompt.
+SPEAKER_HINT_COUNT = "There are exactly {speaker_count} speakers."
+SPEAKER_HINT_UNKNOWN = "Identify different speakers if possible (e.g., 'speaker1', 'speaker2')."
+BASE_CAPTIONS_PROMPT = """
+        Listen to the audio and transcribe the original Japanese text.
+        {speaker_hint}
+        
+        Output a JSON array of objects with these fields:
+        - start: timestamp in SRT format (HH:MM:SS,mmm) e.g., "00:00:05,230"
+        - end: timestamp in SRT format (HH:MM:SS,mmm) e.g., "00:00:08,450"
+        - speaker: string (e.g., "speaker1")
+        - text_ja: transcription
+        
+        IMPORTANT: Use standard SRT timestamp format with HOURS:MINUTES:SECONDS,MILLISECONDS
+        Example: "00:01:23,456" means 1 minute, 23 seconds, and 456 milliseconds
+        
+        Output ONLY the raw JSON array.
+        """
+TRANSLATE_CAPTIONS_PROMPT = """
+        Translate the following Japanese captions to {targets}.
+        Preserve the 'start', 'end', 'speaker', and 'text_ja' fields exactly.
+        Add 'text_en' and 'text_ko' fields to each object as requested.
+        
+        Input JSON:
+        ```json
+        {input_json}
+        ```
+        
+        Output ONLY the raw JSON with translations added.
+        """
+CAPTION_PROMPTS = (SPEAKER_HINT_COUNT, SPEAKER_HINT_UNKNOWN, BASE_CAPTIONS_PROMPT, TRANSLATE_CAPTIONS_PROMPT)
+
+# Responses cached by sha256(model + prompt); least recently used entries are evicted past the cap
+RESPONSE_CACHE_SIZE = 2 * 1024 ** 3
+
+# CJK Unified Ideographs
+_KANJI_RE = re.compile(r'[\u4e00-\u9fff]')
+# Leading ```json / ``` and trailing ``` fences around model output
+_FENCE_RE = re.compile(r'^\s*```(?:json)?\s*\n?|\n?```\s*$')
+# Katakana ァ..ヶ -> hiragana ぁ..ゖ (fixed offset of 0x60)
+_KATA_TO_HIRA = str.maketrans({c: chr(ord(c) - 96) for c in map(chr, range(0x30A1, 0x30F7))})
+
+@functools.lru_cache(maxsize=None)
+def _demucs_device() -> str:
+    """GPU Demucs is an order of magnitude faster; torch is imported lazily (only needed here)."""
+    try:
+        import torch
+        return "cuda" if torch.cuda.is_available() else "cpu"
+    except ImportError:
+        return "cpu"
+
+
+@functools.lru_cache(maxsize=None)
+def _tokenizer_backend() -> typing.Optional[str]:
+    """Tokenizer _ensure_tokenizer will pick (same preference order), found without loading a dictionary."""
+    for module in ("fugashi", "sudachipy"):
+        if importlib.util.find_spec(module) is not None:
+            return "sudachi" if module == "sudachipy" else module
+    return None
+
+
+def _run_blocking(coro: typing.Coroutine, name: str):
+    """
+    Drive one of the async_* methods from synchronous code (worker threads, scripts).
+    asyncio.run can't nest inside a running loop, so fail with a pointer to the coroutine instead.
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+    coro.close()
+    raise RuntimeError(f"CaptionGenerator.{name}() blocks; inside an event loop use 'await async_{name}(...)' instead.")
+
+
+@functools.lru_cache(maxsize=32)
+def _read_prompt(path: Path, mtime_ns: int) -> str:
+    # mtime is part of the key so prompts edited while the app runs are re-read
+    return path.read_text(encoding="utf-8")
+
+
+def _load_prompt(path: Path) -> typing.Optional[str]:
+    """Memoized prompt file contents, or None if the file does not exist."""
+    try:
+        mtime_ns = path.stat().st_mtime_ns
+    except FileNotFoundError:
+        return None
+    return _read_prompt(path, mtime_ns)
+
+
+@functools.lru_cache(maxsize=32)
+def _split_template(template: str) -> tuple[str, ...]:
+    """Template pieces around {input_json}, split once per template."""
+    return tuple(template.split("{input_json}"))
+
+
+def _json_loads(text: str) -> typing.Any:
+    return orjson.loads(text) if orjson else json.loads(text)
 
+
+def _json_dumps(data: typing.Any) -> str:
+    """Compact JSON text with non-ASCII kept as-is (for prompts)."""
+    if orjson:
+        return orjson.dumps(data).decode("utf-8")
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":"))
+
+
+def _write_json(path: Path, data: typing.Any):
+    """Indented JSON file, byte-identical to json.dump(indent=2, ensure_ascii=False)."""
+    if orjson:
+        with open(path, "wb") as f:
+            f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+    else:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+
+
+# Captions stay TypedDicts (plain dicts): they arrive from and go back to JSON,
+# so a dataclass would only add a conversion pass on each side
 class KanjiInfo(typing.TypedDict):
     kanji: str
     yomigana: str
@@ -47,17 +205,31 @@ class CaptionItem(typing.TypedDict):
     kanjis: list[KanjiInfo]
 
 class CaptionGenerator:
+    # Remote file names by audio content hash, shared by every instance in the process
+    _upload_cache: dict[str, str] = {}
+
     def __init__(self, config_path="config.yaml", model_name: typing.Optional[str] = None):
         base_dir = Path(__file__).resolve().parent.parent
         self.config_file = base_dir / config_path
         
+        _load_env()
+
         # Load Config
+        batch_mode = os.getenv("GEMINI_BATCH_MODE", "").lower() in ("1", "true", "yes")
+        vocal_isolation = "demucs"
         if self.config_file.exists():
             with open(self.config_file, "r") as f:
                 self.config = yaml.safe_load(f)
                 config_model = self.config.get("gemini", {}).get("model_id", "gemini-2.5-flash")
+                batch_mode = batch_mode or bool(self.config.get("gemini", {}).get("batch_mode", False))
+                vocal_isolation = self.config.get("preprocess", {}).get("vocal_isolation", vocal_isolation)
         else:
             config_model = "gemini-2.5-flash"
+        self.batch_mode = batch_mode
+        if vocal_isolation not in VOCAL_ISOLATION_MODES:
+            print(f"[!] Unknown preprocess.vocal_isolation '{vocal_isolation}'. Using demucs.")
+            vocal_isolation = "demucs"
+        self.vocal_isolation = vocal_isolation
             
         # Priority: Argument > Config > Default
         self.model_name = model_name if model_name else config_model
@@ -66,18 +238,17 @@ class CaptionGenerator:
         if not self.api_key:
             raise ValueError("GEMINI_API_KEY not found.")
         
+        from google import genai
         genai_client = genai.Client(api_key=self.api_key)
         self.client = genai_client
+        # Async surface of the same client; all Gemini calls go through this
+        self.aclient = genai_client.aio
         self.model_name = self.model_name # keeping attribute for reference
         
-        # Initialize Sudachi if available
-        if SUDACHI_AVAILABLE:
-            self.tokenizer = dictionary.Dictionary(dict="core").create()
-            self.mode = tokenizer.Tokenizer.SplitMode.C
-            print("[*] SudachiPy initialized for Yomigana extraction.")
-        else:
-            print("[!] SudachiPy not found. Yomigana extraction will be skipped.")
-            self.tokenizer = None
+        # Tokenizer (dictionary load is slow) is created on first yomigana use
+        self._tokenizer_loaded = False
+        self.tokenizer = None
+        self.use_fugashi = False
 
         print(f"[*] CaptionGenerator initialized with {self.model_name}")
 
@@ -85,8 +256,50 @@ class CaptionGenerator:
         self.prompts_dir = base_dir / "assets" / "prompts"
         self.prompts_dir.mkdir(parents=True, exist_ok=True)
 
+        # Reruns over the same captions re-send identical prompts; skip those round-trips
+        try:
+            import diskcache
+            self.cache = diskcache.Cache(
+                str(base_dir / ".cache" / "gemini"),
+                size_limit=RESPONSE_CACHE_SIZE,
+                eviction_policy="least-recently-used"
+            )
+        except ImportError:
+            self.cache = None
+
+    def _ensure_tokenizer(self):
+        """Initialize the tokenizer on first use: fugashi if available, Sudachi otherwise."""
+        if self._tokenizer_loaded:
+            return self.tokenizer
+        self._tokenizer_loaded = True
+
+        try:
+            from fugashi import Tagger
+            self.tokenizer = Tagger()
+            self.use_fugashi = True
+            print("[*] fugashi initialized for Yomigana extraction.")
+            return self.tokenizer
+        except ImportError:
+            pass
+        except RuntimeError as e:
+            # Tagger() raises when no UniDic dictionary is installed
+            print(f"[!] fugashi dictionary not found ({e}). Falling back to SudachiPy.")
+
+        try:
+            from sudachipy import tokenizer, dictionary
+            self.tokenizer = dictionary.Dictionary(dict="core").create()
+            self.mode = tokenizer.Tokenizer.SplitMode.C
+            print("[*] SudachiPy initialized for Yomigana extraction.")
+        except ImportError:
+            print("[!] Neither fugashi nor SudachiPy found. Yomigana extraction will be skipped.")
+        return self.tokenizer
+
 
     def generate(self, audio_path: Path, output_dir: Path, target_languages: list[str] = ["ja", "en", "ko"], generate_json: bool = True, speaker_count: typing.Optional[int] = None):
+        """Blocking entry point (for worker threads); see async_generate."""
+        return _run_blocking(self.async_generate(audio_path, output_dir, target_languages, generate_json, speaker_count), "generate")
+
+    async def async_generate(self, audio_path: Path, output_dir: Path, target_languages: list[str] = ["ja", "en", "ko"], generate_json: bool = True, speaker_count: typing.Optional[int] = None):
         base_name = audio_path.stem
         
         # New Structure: output_dir / {base_name} / subtitles / {lang}.srt
@@ -96,12 +309,26 @@ class CaptionGenerator:
         
         print(f"[*] Project Directory: {project_dir}")
 
-
+        # Unchanged audio + settings: the outputs of the last successful run are still valid
+        need_yomigana = "ja" in target_languages and generate_json
+        master_json_path = subtitle_dir / f"{base_name}.json"
+        expected_outputs = [subtitle_dir / f"{lang}.srt" for lang in ("ja", "en", "ko") if lang in target_languages]
+        if need_yomigana:
+            expected_outputs.append(master_json_path)
+        key_path = project_dir / ".pipeline_key"
+        pipeline_key = await asyncio.to_thread(
+            self._pipeline_key, audio_path, target_languages, generate_json, speaker_count, need_yomigana
+        )
+        if (key_path.exists() and key_path.read_text(encoding="utf-8") == pipeline_key
+                and all(p.exists() for p in expected_outputs)):
+            print("[+] Inputs unchanged since last run. Reusing existing outputs.")
+            return master_json_path if need_yomigana else None
+        key_path.unlink(missing_ok=True)
 
         # STEP 0: Audio Preprocessing (FFmpeg + Demucs)
         print("[-] Step 0: Preprocessing Audio (Loudnorm + Vocal Isolation)...")
         try:
-            processed_audio = self._preprocess_audio(audio_path, project_dir / "temp")
+            processed_audio = await asyncio.to_thread(self._preprocess_audio, audio_path, project_dir / "temp", self.vocal_isolation)
             print(f"[+] Used Processed Audio: {processed_audio}")
         except Exception as e:
             print(f"[!] Preprocessing failed: {e}")
@@ -110,171 +337,349 @@ class CaptionGenerator:
 
         # STEP 1: Generate Base Japanese Captions (Audio -> Text)
         print("[-] Step 1: Generating Base Japanese Captions...")
-        captions = self._generate_base_captions(processed_audio, speaker_count)
+        captions = await self._generate_base_captions(processed_audio, speaker_count)
         
         # Save JA SRT immediately
         if "ja" in target_languages:
             self._save_srt(captions, subtitle_dir / "ja.srt", "ja")
 
+        # Yomigana only depends on text_ja, so it can be tokenized while translation is in flight
+        kanjis_by_text = None
+
         # STEP 2: Translation (Text -> Text)
         if "en" in target_languages or "ko" in target_languages:
             print("[-] Step 2: Translating Captions...")
-            captions = self._translate_captions(captions, target_languages)
+            if need_yomigana:
+                captions, kanjis_by_text = await asyncio.gather(
+                    self._translate_captions(captions, target_languages),
+                    asyncio.to_thread(self._kanjis_by_text, captions)
+                )
+            else:
+                captions = await self._translate_captions(captions, target_languages)
             
             # Save Translated SRTs
-            if "en" in target_languages:
-                self._save_srt(captions, subtitle_dir / "en.srt", "en")
-            if "ko" in target_languages:
-                self._save_srt(captions, subtitle_dir / "ko.srt", "ko")
+            self._save_srts(captions, subtitle_dir, [lang for lang in ("en", "ko") if lang in target_languages])
 
         # STEP 3: Yomigana Extraction (Text -> Meta)
         # Only if JA is requested AND Json is generating
-        if "ja" in target_languages and generate_json:
-            print("[-] Step 3: Extracting Yomigana (SudachiPy)...")
-            captions = self._add_yomigana(captions)
+        if need_yomigana:
+            print("[-] Step 3: Extracting Yomigana...")
+            captions = self._add_yomigana(captions, kanjis_by_text)
             
             # Save Master JSON
-            master_json_path = subtitle_dir / f"{base_name}.json"
-            with open(master_json_path, "w", encoding="utf-8") as f:
-                json.dump(captions, f, indent=2, ensure_ascii=False)
+            _write_json(master_json_path, captions)
             print(f"[+] Saved Master JSON: {master_json_path}")
-            return master_json_path
+
+        # Only a run that produced captions may be reused
+        if captions:
+            key_path.write_text(pipeline_key, encoding="utf-8")
         
-        return None
-    def _generate_base_captions(self, audio_path: Path, speaker_count: typing.Optional[int] = None) -> list[CaptionItem]:
-        # Upload using new Client
+        return master_json_path if need_yomigana else None
+
+    def _pipeline_key(self, audio_path: Path, target_languages: list[str], generate_json: bool, speaker_count: typing.Optional[int], need_yomigana: bool) -> str:
+        """Hash of everything that determines generate()'s outputs (audio content, settings, prompts)."""
+        settings = {
+            "langs": sorted(target_languages),
+            "json": generate_json,
+            "speakers": speaker_count,
+            "model": self.model_name,
+            "vocals": self.vocal_isolation,
+            # Readings depend on the tokenizer; keyed by backend name so a hit never loads a dictionary
+            "tokenizer": _tokenizer_backend() if need_yomigana else None,
+            # Editing any prompt (inline or under assets/prompts) invalidates earlier outputs
+            "prompts": self._prompts_digest(),
+        }
+        return self._cache_key(self._file_digest(audio_path), _json_dumps(settings))
+
+    def _prompts_digest(self) -> str:
+        """sha256 over the inline caption prompts and every prompt file _load_prompt can read."""
+        h = hashlib.sha256()
+        for text in CAPTION_PROMPTS:
+            h.update(text.encode("utf-8"))
+            h.update(b"\0")
+        for path in sorted(self.prompts_dir.glob("*.txt")):
+            h.update(path.name.encode("utf-8"))
+            h.update(b"\0")
+            h.update((_load_prompt(path) or "").encode("utf-8"))
+            h.update(b"\0")
+        return h.hexdigest()
+
+    async def _upload_and_wait(self, audio_path: Path, digest: typing.Optional[str] = None):
+        """
+        Upload a file and poll (with backoff) until Gemini finishes processing it.
+        Files already uploaded in this process (same content hash) are reused while still ACTIVE.
+        """
+        if digest is None:
+            digest = await asyncio.to_thread(self._file_digest, audio_path)
+
+        cached_name = CaptionGenerator._upload_cache.get(digest)
+        if cached_name:
+            try:
+                myfile = await self.aclient.files.get(name=cached_name)
+                if myfile.state.name == "ACTIVE":
+                    print(f"    [+] Reusing uploaded file: {myfile.name}")
+                    return myfile
+            except Exception:
+                # Expired (48h) or deleted remotely; upload again
+                pass
+            CaptionGenerator._upload_cache.pop(digest, None)
+
         print(f"    [*] Uploading {audio_path.name}...")
-        myfile = self.client.files.upload(file=str(audio_path))
+        myfile = await self.aclient.files.upload(file=str(audio_path))
         
-        # Wait for processing
+        delay = 0.25
         while myfile.state.name == "PROCESSING":
-            time.sleep(1)
-            myfile = self.client.files.get(name=myfile.name)
-            
-        print(f"    [+] File Ready: {myfile.name}")
-            
-        speaker_hint = f"There are exactly {speaker_count} speakers." if speaker_count else "Identify different speakers if possible (e.g., 'speaker1', 'speaker2')."
-
-        prompt = f"""
-        Listen to the audio and transcribe the original Japanese text.
-        {speaker_hint}
-        
-        Output a JSON array of objects with these fields:
-        - start: timestamp in SRT format (HH:MM:SS,mmm) e.g., "00:00:05,230"
-        - end: timestamp in SRT format (HH:MM:SS,mmm) e.g., "00:00:08,450"
-        - speaker: string (e.g., "speaker1")
-        - text_ja: transcription
-        
-        IMPORTANT: Use standard SRT timestamp format with HOURS:MINUTES:SECONDS,MILLISECONDS
-        Example: "00:01:23,456" means 1 minute, 23 seconds, and 456 milliseconds
-        
-        Output ONLY the raw JSON array.
+            await asyncio.sleep(delay)
+            delay = min(delay * 1.5, 8.0)
+            myfile = await self.aclient.files.get(name=myfile.name)
+
+        if myfile.state.name == "ACTIVE":
+            CaptionGenerator._upload_cache[digest] = myfile.name
+        return myfile
+
+    def _cache_key(self, *parts: str) -> str:
+        # model_name is part of the key, so switching models never serves stale answers
+        h = hashlib.sha256(self.model_name.encode("utf-8"))
+        for part in parts:
+            h.update(b"\0")
+            h.update(part.encode("utf-8"))
+        return h.hexdigest()
+
+    @staticmethod
+    def _file_digest(path: Path) -> str:
+        h = hashlib.sha256()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                h.update(chunk)
+        return h.hexdigest()
+
+    async def _cached_generate(self, prompt: str, accept: typing.Callable[[str], bool] = bool, audio_path: typing.Optional[Path] = None) -> str:
         """
-        
-        response = self.client.models.generate_content(
+        generate_content with a persistent cache in front.
+        Only responses that pass `accept` are stored, so retry loops never get stuck on a bad answer.
+        For audio prompts the file content hash is part of the key and the upload is skipped on a hit.
+        """
+        key = None
+        digest = None
+        if audio_path is not None:
+            digest = await asyncio.to_thread(self._file_digest, audio_path)
+        if self.cache is not None:
+            key_parts = [prompt] if digest is None else [prompt, digest]
+            key = self._cache_key(*key_parts)
+            cached = self.cache.get(key)
+            if cached is not None:
+                print("    [+] Gemini cache hit")
+                return cached
+
+        if audio_path is not None:
+            myfile = await self._upload_and_wait(audio_path, digest)
+            print(f"    [+] File Ready: {myfile.name}")
+            contents = [myfile, prompt]
+        else:
+            contents = prompt
+
+        response = await self.aclient.models.generate_content(
             model=self.model_name,
-            contents=[myfile, prompt]
+            contents=contents
         )
-        return self._parse_json_response(response.text)
+        text = response.text or ""
+        if key is not None and accept(text):
+            self.cache.set(key, text)
+        return text
+
+    def _is_json_response(self, text: str) -> bool:
+        return bool(self._parse_json_response(text))
+
+    async def _generate_base_captions(self, audio_path: Path, speaker_count: typing.Optional[int] = None) -> list[CaptionItem]:
+        speaker_hint = SPEAKER_HINT_COUNT.format(speaker_count=speaker_count) if speaker_count else SPEAKER_HINT_UNKNOWN
 
-    def _translate_captions(self, captions: list[CaptionItem], targets: list[str]) -> list[CaptionItem]:
+        prompt = BASE_CAPTIONS_PROMPT.format(speaker_hint=speaker_hint)
+        
+        text = await self._cached_generate(prompt, accept=self._is_json_response, audio_path=audio_path)
+        return self._parse_json_response(text)
+
+    async def _translate_captions(self, captions: list[CaptionItem], targets: list[str]) -> list[CaptionItem]:
         # We process in batches if too large, but for shorts, one batch is usually fine.
         # We send the JSON text and ask for augmentation.
         
-        prompt = f"""
-        Translate the following Japanese captions to {', '.join([t for t in targets if t!='ja'])}.
-        Preserve the 'start', 'end', 'speaker', and 'text_ja' fields exactly.
-        Add 'text_en' and 'text_ko' fields to each object as requested.
-        
-        Input JSON:
-        ```json
-        {json.dumps(captions, ensure_ascii=False)}
-        ```
-        
-        Output ONLY the raw JSON with translations added.
-        """
+        prompt = TRANSLATE_CAPTIONS_PROMPT.format(
+            targets=', '.join([t for t in targets if t!='ja']),
+            input_json=_json_dumps(captions)
+        )
         
         # Use text input only (faster/cheaper)
-        response = self.client.models.generate_content(
-            model=self.model_name,
-            contents=prompt
-        )
-        return self._parse_json_response(response.text)
+        text = await self._cached_generate(prompt, accept=self._is_json_response)
+        return self._parse_json_response(text)
 
-    def _add_yomigana(self, captions: list[CaptionItem]) -> list[CaptionItem]:
-        if not self.tokenizer:
+    def _add_yomigana(self, captions: list[CaptionItem], kanjis_by_text: typing.Optional[dict[str, list[KanjiInfo]]] = None) -> list[CaptionItem]:
+        """Attach kanji readings to each caption, reusing precomputed results keyed by text_ja."""
+        if not self._ensure_tokenizer():
             return captions
+
+        kanjis_by_text = dict(kanjis_by_text or {})
+        # Texts not covered by the precomputed map (e.g. changed by translation) are tokenized here
+        missing = [item for item in captions if item.get("text_ja", "") not in kanjis_by_text]
+        if missing:
+            kanjis_by_text.update(self._kanjis_by_text(missing))
             
         for item in captions:
-            text = item.get("text_ja", "")
-            if not text:
-                item["kanjis"] = []
-                continue
-                
-            kanji_list = []
-            tokens = self.tokenizer.tokenize(text, self.mode)
-            
-            for token in tokens:
-                surface = token.surface()
-                reading = token.reading_form() # katakana normally
-                
-                # Simple heuristic: if surface contains Kanji, it needs reading
-                if self._has_kanji(surface):
-                    # Convert reading to hiragana
-                    yomigana = self._katakana_to_hiragana(reading)
-                    kanji_list.append({
-                        "kanji": surface,
-                        "yomigana": yomigana
-                    })
-            
-            item["kanjis"] = kanji_list
+            # Copy so captions with identical text don't share one list
+            item["kanjis"] = list(kanjis_by_text[item.get("text_ja", "")])
             
         return captions
 
+    def _kanjis_by_text(self, captions: list[CaptionItem]) -> typing.Optional[dict[str, list[KanjiInfo]]]:
+        """Tokenize every distinct text_ja up front (safe to run in a worker thread)."""
+        if not self._ensure_tokenizer():
+            return None
+
+        # Repeated lines (common in shorts) are tokenized once
+        texts = dict.fromkeys(item.get("text_ja", "") for item in captions)
+        return {text: self._extract_kanjis(text) for text in texts}
+
+    def _tokenize_readings(self, text: str) -> typing.Iterator[tuple[str, str]]:
+        """Yield (surface, katakana reading) pairs from whichever tokenizer is active."""
+        if self.use_fugashi:
+            for node in self.tokenizer(text):
+                # UniDic has no kana for unknown words; keep the surface like Sudachi does
+                yield node.surface, node.feature.kana or node.surface
+        else:
+            for token in self.tokenizer.tokenize(text, self.mode):
+                yield token.surface(), token.reading_form()
+
+    def _extract_kanjis(self, text: str) -> list[KanjiInfo]:
+        if not text:
+            return []
+
+        # Simple heuristic: if surface contains Kanji, it needs reading (converted to hiragana)
+        has_kanji = _KANJI_RE.search
+        return [
+            {"kanji": surface, "yomigana": reading.translate(_KATA_TO_HIRA)}
+            for surface, reading in self._tokenize_readings(text)
+            if has_kanji(surface)
+        ]
+
     def _has_kanji(self, text: str) -> bool:
-        # Check unicode range for CJK Unified Ideographs
-        for char in text:
-            if '\u4e00' <= char <= '\u9fff':
-                return True
-        return False
+        return _KANJI_RE.search(text) is not None
 
     def _katakana_to_hiragana(self, text: str) -> str:
-        # Simple shift
-        return "".join([chr(ord(c) - 96) if ('\u30a1' <= c <= '\u30f6') else c for c in text])
+        return text.translate(_KATA_TO_HIRA)
 
     def _parse_json_response(self, text: str) -> list[CaptionItem]:
         try:
-            clean = text.strip()
-            if clean.startswith("```json"): clean = clean[7:]
-            if clean.startswith("```"): clean = clean[3:]
-            if clean.endswith("```"): clean = clean[:-3]
-            return json.loads(clean)
+            # orjson.JSONDecodeError subclasses json.JSONDecodeError
+            return _json_loads(_FENCE_RE.sub("", text))
         except json.JSONDecodeError:
             print(f"[!] JSON Error. Raw: {text[:100]}...")
             return []
 
     def _save_srt(self, captions: list[CaptionItem], path: Path, lang: str):
-        content = ""
-        key = f"text_{lang}"
+        self._write_srts(captions, {lang: path})
+
+    def _save_srts(self, captions: list[CaptionItem], subtitle_dir: Path, langs: list[str]):
+        """Save {lang}.srt for several languages in a single pass over the captions."""
+        if langs:
+            self._write_srts(captions, {lang: subtitle_dir / f"{lang}.srt" for lang in langs})
+
+    def _write_srts(self, captions: list[CaptionItem], paths: dict[str, Path]):
+        outputs = [(f"text_{lang}", []) for lang in paths]
         for idx, item in enumerate(captions, 1):
-            text = item.get(key, "")
+            # Index, timing and speaker are shared by every language
+            header = f"{idx}\n{item['start']} --> {item['end']}\n"
             speaker = item.get("speaker", "")
-            
-            # Format: [Speaker]: Text (if speaker exists)
-            display_text = f"[{speaker}] {text}" if speaker else text
-            
-            content += f"{idx}\n{item['start']} --> {item['end']}\n{display_text}\n\n"
-        path.write_text(content, encoding="utf-8")
-        print(f"[+] Saved SRT ({lang}): {path}")
+            for key, parts in outputs:
+                text = item.get(key, "")
+                
+                # Format: [Speaker]: Text (if speaker exists)
+                display_text = f"[{speaker}] {text}" if speaker else text
+                
+                parts.append(f"{header}{display_text}\n\n")
+
+        for (lang, path), (_, parts) in zip(paths.items(), outputs):
+            with open(path, "w", encoding="utf-8", buffering=1 << 20) as f:
+                f.writelines(parts)
+            print(f"[+] Saved SRT ({lang}): {path}")
 
     def generate_xml_scenario(self, captions: list[dict], target_lang: str) -> str:
+        """Blocking wrapper (for worker threads and scripts); see async_generate_xml_scenario."""
+        return _run_blocking(self.async_generate_xml_scenario(captions, target_lang), "generate_xml_scenario")
+
+    async def async_generate_xml_scenario(self, captions: list[dict], target_lang: str) -> str:
         """
         Generates an XML scenario using Gemini with strict specific rules:
         1. Transliterate English/Numbers to target language pronunciation.
         2. Strictly NO other changes to content.
         3. Match strict XML structure: <script><speaker_tag>Content</speaker_tag>...</script>
         """
+        prompt = self._scenario_prompt(captions, target_lang)
+
+        # Retry logic
+        for attempt in range(3):
+            try:
+                print(f"[-] Generating XML Scenario for {target_lang} (Attempt {attempt+1}/3)...")
+                text = await self._cached_generate(prompt, accept=lambda t: self._clean_xml_response(t) is not None)
+                
+                result = self._clean_xml_response(text)
+                if result:
+                    return result
+                else:
+                    print(f"[!] Invalid XML format in response. Retrying...")
+            except Exception as e:
+                print(f"[!] Error generating scenario: {e}")
+                await asyncio.sleep(1)
+        
+        raise ValueError("Failed to generate valid XML scenario after 3 attempts.")
+
+    def generate_xml_scenarios(self, jobs: list[tuple[str, list[dict]]]) -> list[typing.Union[str, Exception]]:
+        """Blocking wrapper (for worker threads and scripts); see async_generate_xml_scenarios."""
+        return _run_blocking(self.async_generate_xml_scenarios(jobs), "generate_xml_scenarios")
+
+    async def async_generate_xml_scenarios(self, jobs: list[tuple[str, list[dict]]]) -> list[typing.Union[str, Exception]]:
+        """
+        Generates scenarios for several (target_lang, captions) jobs.
+        In batch mode all prompts go out as one batch job; anything the batch
+        could not answer with valid XML falls back to the realtime path.
+        A job that fails comes back as its exception, so the other languages are kept.
+        """
+        if not self.batch_mode or len(jobs) < 2:
+            return list(await asyncio.gather(
+                *(self.async_generate_xml_scenario(c, lang) for lang, c in jobs),
+                return_exceptions=True
+            ))
+
+        print(f"[-] Generating {len(jobs)} XML Scenarios via batch job...")
+        try:
+            texts = await self.batch_generate([self._scenario_prompt(c, lang) for lang, c in jobs])
+        except Exception as e:
+            print(f"[!] Batch job failed, falling back to realtime: {e}")
+            texts = [None] * len(jobs)
+
+        results = [self._clean_xml_response(t) if t else None for t in texts]
+        retry = [i for i, r in enumerate(results) if not r]
+        if retry:
+            print(f"    [!] {len(retry)} scenario(s) missing from batch, retrying realtime...")
+            redo = await asyncio.gather(
+                *(self.async_generate_xml_scenario(jobs[i][1], jobs[i][0]) for i in retry),
+                return_exceptions=True
+            )
+            for i, r in zip(retry, redo):
+                results[i] = r
+        return results
+
+    def _clean_xml_response(self, text: typing.Optional[str]) -> typing.Optional[str]:
+        """Strip code fences; returns None unless the result is a <script> document."""
+        result = (text or "").strip()
+        if result.startswith("```xml"): result = result[6:]
+        if result.startswith("```"): result = result[3:]
+        if result.endswith("```"): result = result[:-3]
+        result = result.strip()
         
+        # Simple validation check
+        if result.startswith("<script>") and result.endswith("</script>"):
+            return result
+        return None
+
+    def _scenario_prompt(self, captions: list[dict], target_lang: str) -> str:
         # Helper to simplify input for prompt
         minified_input = []
         for c in captions:
@@ -291,64 +696,190 @@ class CaptionGenerator:
 
         # Load prompt from assets/prompts
         prompt_file = self.prompts_dir / f"scenario_refine_{target_lang}.txt"
-        if not prompt_file.exists():
+        prompt_template = _load_prompt(prompt_file)
+        if prompt_template is None:
             print(f"[!] Warning: Scenario prompt for {target_lang} not found. Using English fallback.")
             prompt_file = self.prompts_dir / "scenario_refine_en.txt"
+            prompt_template = _load_prompt(prompt_file)
         
-        if not prompt_file.exists():
+        if prompt_template is None:
              raise FileNotFoundError(f"Scenario prompt file not found: {prompt_file}")
 
-        prompt_template = prompt_file.read_text(encoding="utf-8")
-        
-        # Safe replacement to avoid format() issues with other braces
-        prompt = prompt_template.replace("{input_json}", json.dumps(minified_input, ensure_ascii=False))
+        # Joining the pre-split template replaces every {input_json} (no format() brace issues)
+        return _json_dumps(minified_input).join(_split_template(prompt_template))
 
-        # Retry logic
-        for attempt in range(3):
-            try:
-                print(f"[-] Generating XML Scenario for {target_lang} (Attempt {attempt+1}/3)...")
-                response = self.client.models.generate_content(
-                    model=self.model_name,
-                    contents=prompt
-                )
-                
-                # Cleanup
-                result = response.text.strip()
-                if result.startswith("```xml"): result = result[6:]
-                if result.startswith("```"): result = result[3:]
-                if result.endswith("```"): result = result[:-3]
-                result = result.strip()
-                
-                # Simple validation check
-                if result.startswith("<script>") and result.endswith("</script>"):
-                    return result
-                else:
-                    print(f"[!] Invalid XML format in response. Retrying...")
-            except Exception as e:
-                print(f"[!] Error generating scenario: {e}")
-                time.sleep(1)
-        
-        raise ValueError("Failed to generate valid XML scenario after 3 attempts.")
+    async def submit_batch(self, prompts: list[str]) -> "types.BatchJob":
+        """Write text prompts as JSONL (keyed by index) and submit them as one Gemini batch job."""
+        from google.genai import types
 
-    def _preprocess_audio(self, input_path: Path, output_dir: Path) -> Path:
+        lines = [
+            json.dumps({"key": str(i), "request": {"contents": [{"role": "user", "parts": [{"text": p}]}]}}, ensure_ascii=False)
+            for i, p in enumerate(prompts)
+        ]
+        with tempfile.NamedTemporaryFile("w", suffix=".jsonl", encoding="utf-8", delete=False) as f:
+            f.write("\n".join(lines))
+            jsonl_path = Path(f.name)
+        try:
+            src = await self.aclient.files.upload(
+                file=str(jsonl_path),
+                config=types.UploadFileConfig(display_name=jsonl_path.name, mime_type="jsonl")
+            )
+        finally:
+            jsonl_path.unlink(missing_ok=True)
+
+        job = await self.aclient.batches.create(model=self.model_name, src=src.name)
+        print(f"    [*] Submitted batch {job.name} ({len(prompts)} requests)")
+        return job
+
+    async def wait_batch(self, job: "types.BatchJob", max_delay: float = 60.0) -> dict[str, str]:
+        """Poll a batch job until it finishes; returns response texts by request key."""
+        delay = 5.0
+        while job.state.name not in BATCH_DONE_STATES:
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, max_delay)
+            job = await self.aclient.batches.get(name=job.name)
+
+        if job.state.name != "JOB_STATE_SUCCEEDED":
+            raise RuntimeError(f"Batch {job.name} ended with {job.state.name}: {job.error}")
+
+        raw = await self.aclient.files.download(file=job.dest.file_name)
+        texts = {}
+        for line in raw.decode("utf-8").splitlines():
+            if not line.strip():
+                continue
+            entry = json.loads(line)
+            try:
+                parts = entry["response"]["candidates"][0]["content"]["parts"]
+                texts[entry["key"]] = "".join(part.get("text", "") for part in parts)
+            except (KeyError, IndexError, TypeError):
+                print(f"    [!] Batch entry {entry.get('key')} has no response: {entry.get('error')}")
+        return texts
+
+    async def batch_generate(self, prompts: list[str]) -> list[typing.Optional[str]]:
+        """Run text-only prompts through the batch API; results line up with `prompts`."""
+        job = await self.submit_batch(prompts)
+        texts = await self.wait_batch(job)
+        return [texts.get(str(i)) for i in range(len(prompts))]
+
+    @staticmethod
+    def _preprocess_audio(input_path: Path, output_dir: Path, vocal_isolation: str = "demucs") -> Path:
         """
         1. Normalize loudness (FFmpeg)
-        2. Isolate vocals (Demucs)
-        Returns path to the isolated vocals.
+        2. Isolate vocals (Demucs, or high-pass + noise gate, or skipped)
+        Returns path to the audio to transcribe.
         """
+        normalized_path = CaptionGenerator._normalize_loudness(input_path, output_dir)
+        return CaptionGenerator._isolate_vocals(normalized_path, output_dir, vocal_isolation)
+
+    @staticmethod
+    def _isolate_vocals(normalized_path: Path, output_dir: Path, vocal_isolation: str) -> Path:
+        if vocal_isolation == "none":
+            return normalized_path
+        if vocal_isolation == "highpass":
+            return CaptionGenerator._highpass_gate(normalized_path, output_dir)
+        return CaptionGenerator._separate_vocals(normalized_path, output_dir)
+
+    @staticmethod
+    def _highpass_gate(normalized_path: Path, output_dir: Path) -> Path:
+        """
+        Lightweight vocal cleanup in-process: 80Hz high-pass (rumble/hum) and an RMS
+        noise gate over 20ms frames. No subprocess, no model.
+        """
+        out_path = output_dir / "vocals_highpass.wav"
+        if out_path.exists():
+            return out_path
+
+        try:
+            import numpy as np
+            import soundfile as sf
+            from scipy import signal as sps
+        except ImportError:
+            print("[!] scipy/soundfile not available for highpass isolation. Using normalized audio.")
+            return normalized_path
+
+        print("    [*] Cleaning vocals (high-pass + noise gate)...")
+        data, sr = sf.read(str(normalized_path), dtype="float32", always_2d=True)
+        sos = sps.butter(6, HIGHPASS_CUTOFF_HZ, "hp", fs=sr, output="sos")
+        filtered = sps.sosfiltfilt(sos, data, axis=0).astype(np.float32)
+
+        # Gate frames whose RMS (over all channels) is below the threshold
+        frame = max(1, int(sr * NOISE_GATE_FRAME_SEC))
+        n_frames = len(filtered) // frame
+        if n_frames:
+            framed = filtered[:n_frames * frame].reshape(n_frames, frame, -1)
+            rms = np.sqrt(np.mean(framed ** 2, axis=(1, 2)))
+            gate_lin = 10 ** (NOISE_GATE_DB / 20)
+            framed[rms < gate_lin] = 0.0
+
+        sf.write(str(out_path), filtered, sr, subtype="PCM_16")
+        return out_path
+
+    @staticmethod
+    def _normalize_loudness(input_path: Path, output_dir: Path) -> Path:
+        """Two-pass ffmpeg loudnorm into {output_dir}/normalized.wav (single-pass if analysis fails)."""
         output_dir.mkdir(parents=True, exist_ok=True)
-        
-        # 1. Normalize
         normalized_path = output_dir / "normalized.wav"
-        if not normalized_path.exists():
-            print("    [*] Normalizing loudness...")
-            cmd_norm = [
-                "ffmpeg", "-y", "-i", str(input_path),
-                "-af", "loudnorm=I=-16:LRA=11:TP=-1.5",
-                str(normalized_path)
-            ]
-            subprocess.run(cmd_norm, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
-        
+        if normalized_path.exists():
+            return normalized_path
+
+        print("    [*] Normalizing loudness...")
+        if CaptionGenerator._loudnorm_inproc(input_path, normalized_path):
+            return normalized_path
+
+        # Pass 1: measure only (no encode)
+        analysis = subprocess.run(
+            ["ffmpeg", "-hide_banner", "-nostats", "-i", str(input_path),
+             "-af", f"{CAPTION_LOUDNORM}:print_format=json", "-f", "null", "-"],
+            stdout=subprocess.DEVNULL, stderr=subprocess.PIPE
+        )
+        measured = parse_loudnorm_json(analysis.stderr) if analysis.returncode == 0 else None
+
+        # Pass 2: linear gain from the measurements, resampled back from loudnorm's 192kHz
+        if measured and measured.get("input_i") not in (None, "-inf"):
+            filter_str = f"{loudnorm_filter(CAPTION_LOUDNORM, measured)},aresample=48000"
+        else:
+            filter_str = CAPTION_LOUDNORM
+        cmd_norm = [
+            "ffmpeg", "-y", "-i", str(input_path),
+            "-af", filter_str,
+            str(normalized_path)
+        ]
+        subprocess.run(cmd_norm, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        return normalized_path
+
+    @staticmethod
+    def _loudnorm_inproc(input_path: Path, output_path: Path) -> bool:
+        """
+        Normalize a short clip with soundfile + pyloudnorm, without spawning ffmpeg.
+        Returns False (caller uses ffmpeg) for long/unreadable/too-short inputs, when
+        pyloudnorm is missing, or when a single gain can't get close enough to the target.
+        """
+        try:
+            import soundfile as sf
+            import pyloudnorm
+        except ImportError:
+            return False
+        try:
+            info = sf.info(str(input_path))
+            if info.duration >= INPROC_LOUDNORM_MAX_SEC:
+                return False
+            data, sr = sf.read(str(input_path), dtype="float64")
+            loudness = pyloudnorm.Meter(sr).integrated_loudness(data)
+        except (RuntimeError, ValueError, TypeError):
+            # Unsupported format for libsndfile, or shorter than one 400ms loudness block
+            return False
+
+        if math.isfinite(loudness):
+            data, shortfall_db = apply_loudness_gain(data, loudness, CAPTION_TARGET_LUFS, CAPTION_PEAK_CEILING)
+            if abs(shortfall_db) > INPROC_LOUDNORM_MAX_SHORTFALL_DB:
+                print(f"    [.] Linear gain would land at {CAPTION_TARGET_LUFS - shortfall_db:.1f} LUFS, using ffmpeg loudnorm.")
+                return False
+        # else: silent clip, nothing to normalize
+        sf.write(str(output_path), data, sr, subtype="PCM_16")
+        return True
+
+    @staticmethod
+    def _separate_vocals(normalized_path: Path, output_dir: Path) -> Path:
         # 2. Vocal Separation (Demucs)
         # Demucs output structure: {output_dir}/htdemucs/{track_name}/vocals.wav
         # We need to correctly identify the track name demucs uses (usually filename without extension)
@@ -362,7 +893,7 @@ class CaptionGenerator:
             # demucs --two-stems=vocals -o {out_dir} {input}
             cmd_demucs = [
                 "demucs", "--two-stems=vocals",
-                "-d", "cpu",
+                "-d", _demucs_device(),
                 "-o", str(demucs_out),
                 str(normalized_path)
             ]
@@ -374,7 +905,7 @@ class CaptionGenerator:
                 cmd_demucs_py = [
                     sys.executable, "-m", "demucs", 
                     "--two-stems=vocals",
-                    "-d", "cpu",
+                    "-d", _demucs_device(),
                     "-o", str(demucs_out),
                     str(normalized_path)
                 ]
@@ -386,60 +917,63 @@ class CaptionGenerator:
             raise FileNotFoundError(f"Demucs output not found at {expected_vocals}")
 
     def refine_script(self, captions: list[CaptionItem]) -> list[CaptionItem]:
+        """Blocking wrapper (for worker threads and scripts); see async_refine_script."""
+        return _run_blocking(self.async_refine_script(captions), "refine_script")
+
+    async def async_refine_script(self, captions: list[CaptionItem]) -> list[CaptionItem]:
         """
         Refines the Japanese script by removing filler and focusing on story relevance.
         Uses assets/prompts/refine_script_ja.txt
         """
         prompt_file = self.prompts_dir / "refine_script_ja.txt"
-        if not prompt_file.exists():
+        prompt_text = _load_prompt(prompt_file)
+        if prompt_text is None:
             print(f"[!] Warning: Refine prompt not found at {prompt_file}. Using default.")
             prompt_text = "Refine the following Japanese script to remove filler and improved flow."
-        else:
-            prompt_text = prompt_file.read_text(encoding="utf-8")
 
         prompt = f"""
         {prompt_text}
 
         # Input Data:
-        {json.dumps(captions, ensure_ascii=False)}
+        {_json_dumps(captions)}
         """
         
         for attempt in range(3):
             try:
                 print(f"[-] Refining script with {self.model_name} (Attempt {attempt+1}/3)...")
-                response = self.client.models.generate_content(
-                    model=self.model_name,
-                    contents=prompt
-                )
-                result = self._parse_json_response(response.text)
+                text = await self._cached_generate(prompt, accept=self._is_json_response)
+                result = self._parse_json_response(text)
                 if result:
                     return result
                 print("[!] Empty or invalid JSON received. Retrying...")
             except Exception as e:
                 print(f"[!] Error during refinement: {e}")
-                time.sleep(1)
+                await asyncio.sleep(1)
         
         print("[!] Refinement failed after 3 attempts.")
         raise ValueError("Failed to refine script after 3 attempts. Please check logs.")
 
 
     def translate_refined_script(self, captions: list[CaptionItem], targets: list[str]) -> list[CaptionItem]:
+        """Blocking wrapper (for worker threads and scripts); see async_translate_refined_script."""
+        return _run_blocking(self.async_translate_refined_script(captions, targets), "translate_refined_script")
+
+    async def async_translate_refined_script(self, captions: list[CaptionItem], targets: list[str]) -> list[CaptionItem]:
         """
         Translates the refined script to target languages.
         Uses assets/prompts/translate_script.txt
         """
         prompt_file = self.prompts_dir / "translate_script.txt"
-        if not prompt_file.exists():
+        prompt_text = _load_prompt(prompt_file)
+        if prompt_text is None:
             print(f"[!] Warning: Translate prompt not found at {prompt_file}. Using default.")
             prompt_text = "Translate the script to English and Korean."
-        else:
-            prompt_text = prompt_file.read_text(encoding="utf-8")
             
         prompt = f"""
         {prompt_text}
         
         # Input Data:
-        {json.dumps(captions, ensure_ascii=False)}
+        {_json_dumps(captions)}
         
         # Targets: {', '.join(targets)}
         """
@@ -447,17 +981,14 @@ class CaptionGenerator:
         for attempt in range(3):
             try:
                 print(f"[-] Translating refined script (Attempt {attempt+1}/3)...")
-                response = self.client.models.generate_content(
-                    model=self.model_name,
-                    contents=prompt
-                )
-                result = self._parse_json_response(response.text)
+                text = await self._cached_generate(prompt, accept=self._is_json_response)
+                result = self._parse_json_response(text)
                 if result:
                     return result
                 print("[!] Empty or invalid JSON received. Retrying...")
             except Exception as e:
                 print(f"[!] Error during translation: {e}")
-                time.sleep(1)
+                await asyncio.sleep(1)
 
         print("[!] Translation failed after 3 attempts.")
         raise ValueError("Failed to translate script after 3 attempts. Please check logs.")
@@ -465,23 +996,16 @@ class CaptionGenerator:
 
 
     def simple_transcribe(self, audio_path: Path, lang: str = "ja") -> str:
+        """Blocking wrapper (for worker threads and scripts); see async_simple_transcribe."""
+        return _run_blocking(self.async_simple_transcribe(audio_path, lang), "simple_transcribe")
+
+    async def async_simple_transcribe(self, audio_path: Path, lang: str = "ja") -> str:
         """Transcribe audio for reference text using Gemini"""
         try:
-            print(f"    [*] Uploading for transcription: {audio_path.name}")
-            myfile = self.client.files.upload(file=str(audio_path))
-            
-            while myfile.state.name == "PROCESSING":
-                time.sleep(1)
-                myfile = self.client.files.get(name=myfile.name)
-            
+            print(f"    [*] Transcribing: {audio_path.name}")
             prompt = f"Transcribe this audio in {lang}. Output ONLY the transcription text. Do not include timestamps or speaker labels."
-            response = self.client.models.generate_content(
-                model=self.model_name,
-                contents=[myfile, prompt]
-            )
-            if response.text:
-                return response.text.strip()
-            return ""
+            text = await self._cached_generate(prompt, accept=lambda t: bool(t.strip()), audio_path=audio_path)
+            return text.strip()
         except Exception as e:
             print(f"[!] Error transcribing {audio_path}: {e}")
             return ""
@@ -1,28 +1,109 @@
 import sys
 from pathlib import Path
+import os
 import shutil
 import asyncio
 
+import numpy as np
+import pytest
+import soundfile as sf
+
 # Add project root to sys.path
 PROJECT_ROOT = Path(__file__).parent.parent
 sys.path.append(str(PROJECT_ROOT))
 
-# Ensure pydub is installed (it should be per requirements)
-try:
-    from pydub import AudioSegment
-except ImportError:
-    print("pydub not installed. Please pip install pydub")
-    sys.exit(1)
-
 from core.gen_audio import GenAudio
 
+SOURCE_FILE = PROJECT_ROOT / "assets/audios/ko/male/guwon.mp3"
+
+def load_source(path: Path) -> tuple[np.ndarray, int]:
+    """Decode the source once in-process (libsndfile reads MP3); fixtures derive from this array"""
+    return sf.read(str(path), dtype="float32", always_2d=True)
+
+def gain(data: np.ndarray, db: float) -> np.ndarray:
+    return data * np.float32(10 ** (db / 20))
+
+def probe(path: Path) -> tuple[int, float]:
+    """(length in ms, dBFS) read in-process with libsndfile; no ffmpeg decode"""
+    data, sr = sf.read(str(path), dtype="float32")
+    length_ms = len(data) * 1000 // sr
+    rms = float(np.sqrt(np.mean(np.square(data, dtype=np.float64)))) if data.size else 0.0
+    dbfs = 20 * np.log10(rms) if rms > 0 else -float("inf")
+    return length_ms, dbfs
+
+def is_fresh(path: Path, source: Path) -> bool:
+    """Fixture exists and was written after the source last changed"""
+    return path.exists() and path.stat().st_mtime_ns >= source.stat().st_mtime_ns
+
+def fast_copy(src: Path, dst: Path):
+    """
+    Hardlink dst to src (no data copied). Safe because remove_silence/normalize_audio
+    write to a temp file and rename it over dst, which leaves src untouched.
+    """
+    dst.unlink(missing_ok=True)
+    try:
+        os.link(src, dst)
+    except OSError:
+        # Different filesystem or no hardlink support
+        shutil.copyfile(src, dst)
+
+def write_fixture(path: Path, data: np.ndarray, sr: int):
+    """WAV fixture (16-bit, clipped like any PCM export); no MP3 encode/decode round-trip"""
+    sf.write(str(path), data, sr, subtype="PCM_16")
+
+async def integrated_loudness(gen_audio: GenAudio, path: Path) -> float:
+    measured, _ = await gen_audio._measure_loudness(path)
+    return float(measured["input_i"])
+
+async def _collect(agen) -> list[str]:
+    return [log async for log in agen]
+
+
+requires_audio = pytest.mark.skipif(
+    shutil.which("ffmpeg") is None or not SOURCE_FILE.exists(),
+    reason="needs ffmpeg and the sample voice"
+)
+
+
+@requires_audio
+def test_remove_silence_trims_padding(tmp_path: Path):
+    """2s of silence on both ends is cut back to the trimmed remainder"""
+    audio, sr = load_source(SOURCE_FILE)
+    silence = np.zeros((2 * sr, audio.shape[1]), dtype=np.float32)
+    path = tmp_path / "silence_added.wav"
+    write_fixture(path, np.concatenate([silence, audio, silence]), sr)
+
+    logs = asyncio.run(_collect(GenAudio(PROJECT_ROOT).remove_silence(path)))
+
+    assert logs[-1].startswith("[+]"), logs
+    cleaned_ms, _ = probe(path)
+    assert cleaned_ms < len(audio) * 1000 // sr + 500
+
+
+@requires_audio
+@pytest.mark.parametrize("db", [10, -20])
+def test_normalize_audio_reaches_target(tmp_path: Path, db: float):
+    """Loud and quiet copies both end up at -14 LUFS with the length unchanged"""
+    audio, sr = load_source(SOURCE_FILE)
+    path = tmp_path / "fixture.wav"
+    write_fixture(path, gain(audio, db), sr)
+    gen_audio = GenAudio(PROJECT_ROOT)
+
+    logs = asyncio.run(_collect(gen_audio.normalize_audio(path)))
+
+    assert logs[-1] == "[+] Normalization complete.", logs
+    assert asyncio.run(integrated_loudness(gen_audio, path)) == pytest.approx(-14.0, abs=1.0)
+    norm_ms, _ = probe(path)
+    assert norm_ms == len(audio) * 1000 // sr
+
+
 async def main():
     base_dir = PROJECT_ROOT
     output_dir = base_dir / "tests" / "manual_audio_test"
     output_dir.mkdir(parents=True, exist_ok=True)
-    
-    source_file = base_dir / "assets/audios/ko/male/guwon.mp3"
-    
+
+    source_file = SOURCE_FILE
+
     if not source_file.exists():
         print(f"Source file not found: {source_file}")
         return
@@ -32,76 +113,68 @@ async def main():
 
     # Load Source
     print("[-] Loading audio...")
-    audio = AudioSegment.from_file(source_file)
-    print(f"    Length: {len(audio)}ms, dBFS: {audio.dBFS}")
-    
+    audio, sr = load_source(source_file)
+    audio_ms = len(audio) * 1000 // sr
+    print(f"    Length: {audio_ms}ms")
+
     # Instantiate GenAudio
     gen_audio = GenAudio(base_dir)
 
     # --- Test 1: Silence Trimming ---
     print("\n[Test 1] Silence Trimming")
     # Insert silence at Start and End (easier to verify)
-    silence_2s = AudioSegment.silent(duration=2000)
-    
-    # Prepend and Append silence
-    bad_audio = silence_2s + audio + silence_2s
-    
-    path_silence_added = output_dir / "silence_added.mp3"
-    bad_audio.export(path_silence_added, format="mp3")
-    print(f"    [+] Created: {path_silence_added.name} (Length: {len(bad_audio)}ms)")
-    
+    silence_2s = np.zeros((2 * sr, audio.shape[1]), dtype=np.float32)
+
+    path_silence_added = output_dir / "silence_added.wav"
+    if is_fresh(path_silence_added, source_file):
+        print(f"    [=] Reusing: {path_silence_added.name}")
+    else:
+        write_fixture(path_silence_added, np.concatenate([silence_2s, audio, silence_2s]), sr)
+        print(f"    [+] Created: {path_silence_added.name} (Length: {audio_ms + 4000}ms)")
+
     # Prepare target for optimization
-    path_silence_removed = output_dir / "silence_removed.mp3"
-    shutil.copy(path_silence_added, path_silence_removed)
-    
+    path_silence_removed = output_dir / "silence_removed.wav"
+    fast_copy(path_silence_added, path_silence_removed)
+
     print(f"    [*] Running remove_silence on {path_silence_removed.name}...")
     # CALL GRANULAR METHOD
     async for log in gen_audio.remove_silence(path_silence_removed):
         print(f"      {log}")
-        
+
     # Verify length reduction
-    cleaned_audio = AudioSegment.from_file(path_silence_removed)
-    print(f"    [=] Result Length: {len(cleaned_audio)}ms (Original Input Audio: {len(audio)}ms)")
+    cleaned_ms, _ = probe(path_silence_removed)
+    print(f"    [=] Result Length: {cleaned_ms}ms (Original Input Audio: {audio_ms}ms)")
 
     # --- Test 2: Normalization ---
     print("\n[Test 2] Normalization")
-    
-    # Amplified (+10dB)
-    amplified_audio = audio + 10
-    path_amplified = output_dir / "amplified.mp3"
-    amplified_audio.export(path_amplified, format="mp3")
-    print(f"    [+] Created: {path_amplified.name} (dBFS: {amplified_audio.dBFS:.2f})")
-    
-    path_norm_amp = output_dir / "normalized-foramplified.mp3"
-    shutil.copy(path_amplified, path_norm_amp)
-    
-    print(f"    [*] Running normalize_audio on {path_norm_amp.name}...")
-    # CALL GRANULAR METHOD
-    async for log in gen_audio.normalize_audio(path_norm_amp):
-        print(f"      {log}")
-        
-    norm_amp_audio = AudioSegment.from_file(path_norm_amp)
-    print(f"    [=] Result dBFS: {norm_amp_audio.dBFS:.2f} (Target ~ -14 LUFS)")
-    print(f"    [=] Result Length: {len(norm_amp_audio)}ms (Should match original: {len(audio)}ms)")
-
-
-    # Reduced (-20dB)
-    reduced_audio = audio - 20
-    path_reduced = output_dir / "reduced.mp3"
-    reduced_audio.export(path_reduced, format="mp3")
-    print(f"    [+] Created: {path_reduced.name} (dBFS: {reduced_audio.dBFS:.2f})")
-    
-    path_norm_red = output_dir / "normalized-reduced.mp3"
-    shutil.copy(path_reduced, path_norm_red)
-    
-    print(f"    [*] Running normalize_audio on {path_norm_red.name}...")
-    # CALL GRANULAR METHOD
-    async for log in gen_audio.normalize_audio(path_norm_red):
-        print(f"      {log}")
+    # Fixtures are derived in memory from the decoded source and written as WAV.
+    # Files newer than the source are reused as-is.
+    fixtures = []
+    for name, db in (("amplified", 10), ("reduced", -20)):
+        path_fixture = output_dir / f"{name}.wav"
+        if is_fresh(path_fixture, source_file):
+            print(f"    [=] Reusing: {path_fixture.name}")
+        else:
+            write_fixture(path_fixture, gain(audio, db), sr)
+            print(f"    [+] Created: {path_fixture.name} (dBFS: {probe(path_fixture)[1]:.2f})")
+
+        path_norm = output_dir / f"normalized-{name}.wav"
+        fast_copy(path_fixture, path_norm)
+        fixtures.append(path_norm)
+
+    # CALL GRANULAR METHOD (both files are independent, so normalize them concurrently)
+    print(f"    [*] Running normalize_audio on {', '.join(p.name for p in fixtures)}...")
+    all_logs = await asyncio.gather(*(_collect(gen_audio.normalize_audio(p)) for p in fixtures))
+
+    for path, logs in zip(fixtures, all_logs):
+        print(f"    [{path.name}]")
+        for log in logs:
+            print(f"      {log}")
 
-    norm_red_audio = AudioSegment.from_file(path_norm_red)
-    print(f"    [=] Result dBFS: {norm_red_audio.dBFS:.2f} (Target ~ -14 LUFS)")
-    print(f"    [=] Result Length: {len(norm_red_audio)}ms (Should match original: {len(audio)}ms)")
+        norm_ms, norm_dbfs = probe(path)
+        loudness = await integrated_loudness(gen_audio, path)
+        print(f"    [=] Result: {loudness:.2f} LUFS, {norm_dbfs:.2f} dBFS (Target ~ -14 LUFS)")
+        print(f"    [=] Result Length: {norm_ms}ms (Should match original: {audio_ms}ms)")
 
     print("\n[Done] Check output directory for results.")
 
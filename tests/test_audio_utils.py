@@ -0,0 +1,124 @@
+"""Unit tests for core.audio_utils."""
+import sys
+import math
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+# Add project root to path
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from core.audio_utils import (
+    parse_loudnorm_json,
+    loudnorm_filter,
+    true_peak,
+    apply_loudness_gain,
+    LOUDNORM_MAX_GAIN_DB,
+    TRUE_PEAK_BLOCK,
+)
+
+# Tail of a real `loudnorm=...:print_format=json` analysis pass
+LOUDNORM_STDERR = b"""[Parsed_loudnorm_0 @ 0x55d1c]
+{
+\t"input_i" : "-27.61",
+\t"input_tp" : "-8.02",
+\t"input_lra" : "3.40",
+\t"input_thresh" : "-37.83",
+\t"output_i" : "-14.51",
+\t"output_tp" : "-1.00",
+\t"output_lra" : "2.70",
+\t"output_thresh" : "-24.60",
+\t"normalization_type" : "dynamic",
+\t"target_offset" : "0.51"
+}
+"""
+
+
+def test_parse_loudnorm_json_reads_last_block():
+    stderr = b"Stream #0:0 {not json}\n" + LOUDNORM_STDERR
+    measured = parse_loudnorm_json(stderr)
+
+    assert measured["input_i"] == "-27.61"
+    assert measured["target_offset"] == "0.51"
+
+
+def test_parse_loudnorm_json_without_block():
+    assert parse_loudnorm_json(b"Error opening input file") is None
+
+
+def test_parse_loudnorm_json_malformed_block():
+    assert parse_loudnorm_json(b'{"input_i" : -27.61,,}') is None
+
+
+def test_loudnorm_filter_feeds_measurements():
+    measured = parse_loudnorm_json(LOUDNORM_STDERR)
+    filter_str = loudnorm_filter("loudnorm=I=-14:TP=-1.0:LRA=11", measured)
+
+    assert filter_str == (
+        "loudnorm=I=-14:TP=-1.0:LRA=11"
+        ":measured_I=-27.61:measured_TP=-8.02:measured_LRA=3.40"
+        ":measured_thresh=-37.83:offset=0.51:linear=true"
+    )
+
+
+@pytest.fixture
+def scipy_signal():
+    return pytest.importorskip("scipy.signal")
+
+
+def _quarter_rate_sine(frames: int, amplitude: float) -> np.ndarray:
+    """fs/4 sine sampled 45 degrees off its crests: sample peak is amplitude/sqrt(2)"""
+    return amplitude * np.sin(2 * np.pi * np.arange(frames) / 4 + np.pi / 4)
+
+
+def test_true_peak_finds_intersample_peaks(scipy_signal):
+    data = _quarter_rate_sine(48000, 0.5)
+
+    assert np.abs(data).max() == pytest.approx(0.5 / math.sqrt(2))
+    assert true_peak(data) == pytest.approx(0.5, rel=0.02)
+
+
+def test_true_peak_across_blocks_and_channels(scipy_signal):
+    data = np.zeros((TRUE_PEAK_BLOCK * 2 + 100, 2))
+    # A single spike right on a block boundary, in the second channel
+    data[TRUE_PEAK_BLOCK, 1] = 0.8
+
+    assert true_peak(data) == pytest.approx(0.8, rel=0.05)
+
+
+def test_apply_loudness_gain_reaches_target(scipy_signal):
+    data = np.full(100, 0.01)
+    out, shortfall = apply_loudness_gain(data, loudness=-20.0, target_lufs=-14.0, peak_ceiling=1.0)
+
+    assert out is data  # scaled in place
+    assert out[0] == pytest.approx(0.01 * 10 ** (6 / 20))
+    assert shortfall == pytest.approx(0.0)
+
+
+def test_apply_loudness_gain_clamps_large_gain(scipy_signal):
+    data = np.full(100, 0.001)
+    out, shortfall = apply_loudness_gain(data, loudness=-50.0, target_lufs=-14.0, peak_ceiling=1.0)
+
+    assert out[0] == pytest.approx(0.001 * 10 ** (LOUDNORM_MAX_GAIN_DB / 20))
+    assert shortfall == pytest.approx(36.0 - LOUDNORM_MAX_GAIN_DB)
+
+
+def test_apply_loudness_gain_caps_true_peak(scipy_signal):
+    data = _quarter_rate_sine(48000, 0.5)
+    peak_before = true_peak(data)
+    ceiling = 10 ** (-1.0 / 20)
+    out, shortfall = apply_loudness_gain(data, loudness=-20.0, target_lufs=-14.0, peak_ceiling=ceiling)
+
+    # The sample peak alone would have allowed more gain
+    assert true_peak(out) == pytest.approx(ceiling, rel=1e-3)
+    assert np.abs(out).max() < ceiling
+    assert shortfall == pytest.approx(6.0 - 20 * math.log10(ceiling / peak_before))
+
+
+def test_apply_loudness_gain_empty_input():
+    out, shortfall = apply_loudness_gain(np.zeros(0), loudness=-20.0, target_lufs=-14.0, peak_ceiling=1.0)
+
+    assert out.size == 0
+    assert shortfall == pytest.approx(0.0)
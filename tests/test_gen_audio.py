@@ -0,0 +1,177 @@
+"""Unit tests for core.gen_audio."""
+import sys
+import shutil
+import asyncio
+import textwrap
+from pathlib import Path
+
+import numpy as np
+import pytest
+import soundfile as sf
+
+# Add project root to path
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from core import gen_audio
+from core.gen_audio import GenAudio, _rejoin_spans, _vad_speech_spans
+
+# Stand-in for GPT-SoVITS' inference_cli.py: writes 0.5s silence, 1s tone, 2s silence,
+# 1s tone with soundfile (format from the --output_path extension, like the real CLI)
+FAKE_INFERENCE_CLI = textwrap.dedent('''
+    import argparse
+    import numpy as np
+    import soundfile as sf
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--output_path")
+    args, _ = parser.parse_known_args()
+
+    sr = 32000
+    tone = 0.3 * np.sin(2 * np.pi * 440 * np.arange(sr) / sr)
+    silence = np.zeros(sr // 2)
+    audio = np.concatenate([silence, tone, silence, silence, silence, silence, tone])
+    print("Generating: 100%|##########| 10/10 [00:01<00:00, 9.5it/s]", flush=True)
+    sf.write(args.output_path, audio.astype(np.float32), sr)
+    print("done", flush=True)
+''')
+
+
+@pytest.fixture
+def fake_base_dir(tmp_path: Path) -> Path:
+    script = tmp_path / "external" / "GPT-SoVITS" / "GPT_SoVITS" / "inference_cli.py"
+    script.parent.mkdir(parents=True)
+    script.write_text(FAKE_INFERENCE_CLI, encoding="utf-8")
+    return tmp_path
+
+
+async def _collect(agen) -> list[str]:
+    return [log async for log in agen]
+
+
+def test_generate_voice_streams_cli_output(fake_base_dir: Path):
+    """CLI output is yielded line by line, including the tqdm bar, then the saved file"""
+    output_path = fake_base_dir / "out" / "001_voice.wav"
+    output_path.parent.mkdir()
+    gen_audio = GenAudio(fake_base_dir)
+
+    logs = asyncio.run(_collect(gen_audio.async_generate_voice(
+        gpt_model_path=Path("gpt.ckpt"),
+        sovits_model_path=Path("sovits.pth"),
+        ref_audio_path=Path("ref.wav"),
+        ref_text="ref",
+        ref_language="ja",
+        target_text="target",
+        target_language="ja",
+        output_path=output_path,
+    )))
+
+    assert logs[0].startswith("[*] Executing: ")
+    assert logs[1:] == [
+        "Generating: 100%|##########| 10/10 [00:01<00:00, 9.5it/s]",
+        "done",
+        f"[+] Saved: {output_path.name}",
+    ]
+
+    data, sr = sf.read(str(output_path))
+    assert sr == 32000
+    assert len(data) / sr == pytest.approx(4.5)
+
+
+def test_rejoin_spans_inserts_silent_gaps():
+    samples = np.arange(1, 21, dtype=np.int16).reshape(10, 2)
+    out = _rejoin_spans(samples, [(0, 2), (5, 7)], gap_len=3)
+
+    assert out.shape == (2 + 3 + 2, 2)
+    np.testing.assert_array_equal(out[:2], samples[0:2])
+    np.testing.assert_array_equal(out[2:5], 0)
+    np.testing.assert_array_equal(out[5:], samples[5:7])
+
+
+def test_rejoin_spans_single_span_has_no_gap():
+    samples = np.ones((6, 1), dtype=np.int16)
+    out = _rejoin_spans(samples, [(1, 4)], gap_len=100)
+
+    assert out.shape == (3, 1)
+
+
+@pytest.fixture
+def fake_vad(monkeypatch):
+    """Install a fake Silero model answering with `fake_vad.speech` per 512-sample chunk"""
+    torch = pytest.importorskip("torch")
+    pytest.importorskip("torchaudio")
+    if not torch.cuda.is_available():
+        pytest.skip("Silero VAD path runs on CUDA only")
+
+    class FakeVad:
+        speech: list[float] = []
+
+        def audio_forward(self, x, sr):
+            return torch.tensor([self.speech], device=x.device)
+
+        def reset_states(self):
+            pass
+
+    model = FakeVad()
+    monkeypatch.setattr(gen_audio, "_load_vad", lambda: (model, None))
+    return model
+
+
+def test_vad_speech_spans_splits_on_long_pauses(fake_vad):
+    """Pauses > 500ms split the clip; each span keeps 100ms of the pause around it"""
+    # 1s speech, 1s pause, 1s speech at 16kHz
+    fake_vad.speech = [1.0] * 31 + [0.0] * 31 + [1.0] * 32
+    sr = 16000
+    samples = np.zeros((len(fake_vad.speech) * gen_audio.VAD_CHUNK, 1), dtype=np.int16)
+
+    pad = int(0.1 * sr)
+    assert _vad_speech_spans(samples, sr) == [(0, 31 * 512 + pad), (62 * 512 - pad, len(samples))]
+
+
+def test_vad_speech_spans_without_chunks(fake_vad):
+    fake_vad.speech = []
+
+    assert _vad_speech_spans(np.zeros((100, 1), dtype=np.int16), 16000) == []
+
+
+def test_vad_trim_skips_inputs_libsndfile_cannot_open(tmp_path: Path, monkeypatch):
+    """Unprobeable input falls back to ffmpeg silenceremove instead of raising"""
+    monkeypatch.setattr(gen_audio, "_load_vad", lambda: (object(), None))
+    src = tmp_path / "ref.m4a"
+    src.write_bytes(b"\x00\x00\x00\x18ftypM4A ")
+
+    assert asyncio.run(GenAudio(tmp_path)._vad_trim(src, tmp_path / "out.m4a")) is None
+
+
+@pytest.mark.skipif(shutil.which("ffmpeg") is None, reason="ffmpeg not installed")
+def test_normalize_audio_falls_back_to_ffmpeg_for_peaky_audio(tmp_path: Path):
+    """Quiet speech with sharp clicks: one linear gain would stop at the peak ceiling"""
+    pyln = pytest.importorskip("pyloudnorm")
+    sr = 48000
+    rng = np.random.default_rng(0)
+    data = 0.01 * rng.standard_normal(sr * 3)
+    data[::sr // 2] = 0.9
+    path = tmp_path / "001_voice.wav"
+    sf.write(str(path), data, sr, subtype="PCM_16")
+
+    logs = asyncio.run(_collect(GenAudio(tmp_path).normalize_audio(path)))
+
+    assert logs[0].endswith("using ffmpeg loudnorm."), logs
+    assert logs[-1] == "[+] Normalization complete."
+    out, out_sr = sf.read(str(path))
+    assert out_sr == sr
+    assert pyln.Meter(sr).integrated_loudness(out) == pytest.approx(-14.0, abs=1.0)
+
+
+def test_normalize_audio_in_process_reaches_target(tmp_path: Path):
+    pyln = pytest.importorskip("pyloudnorm")
+    sr = 48000
+    tone = 0.15 * np.sin(2 * np.pi * 440 * np.arange(sr * 2) / sr)
+    path = tmp_path / "001_voice.wav"
+    sf.write(str(path), tone, sr, subtype="PCM_16")
+
+    logs = asyncio.run(_collect(GenAudio(tmp_path).normalize_audio(path)))
+
+    assert logs == ["[+] Normalization complete."]
+    out, _ = sf.read(str(path))
+    assert pyln.Meter(sr).integrated_loudness(out) == pytest.approx(-14.0, abs=0.1)
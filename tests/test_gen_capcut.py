@@ -0,0 +1,152 @@
+"""Unit tests for core.gen_capcut."""
+import json
+import os
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+import soundfile as sf
+
+# Add project root to path
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from core.gen_capcut import CapCutGenerator
+
+
+@pytest.fixture
+def generator(tmp_path: Path) -> CapCutGenerator:
+    return CapCutGenerator(tmp_path)
+
+
+def _write_wav(path: Path, seconds: float, sr: int = 16000) -> Path:
+    sf.write(str(path), np.zeros(int(seconds * sr), dtype=np.int16), sr, subtype="PCM_16")
+    return path
+
+
+def test_split_text_clean_short_text_is_untouched(generator: CapCutGenerator):
+    assert generator._split_text_clean("こんにちは") == (["こんにちは"], "こんにちは")
+    assert generator._split_text_clean("") == ([""], "")
+
+
+def test_split_text_clean_wraps_every_16_chars(generator: CapCutGenerator):
+    text = "あ" * 16 + "い" * 16 + "う" * 3
+    lines, joined = generator._split_text_clean(text)
+
+    assert lines == ["あ" * 16, "い" * 16, "う" * 3]
+    assert joined == "\n".join(lines)
+
+
+def test_map_yomigana_maps_tokens_in_order(generator: CapCutGenerator):
+    kanjis = [
+        {"kanji": "日本", "yomigana": "にほん"},
+        {"kanji": "東京", "yomigana": "とうきょう"},
+    ]
+    text = "日本の首都は東京です"
+
+    assert generator._map_yomigana(text, kanjis) == {
+        0: ("にほん", 2, 0),
+        6: ("とうきょう", 2, 1),
+    }
+
+
+def test_map_yomigana_skips_missing_and_repeated_tokens(generator: CapCutGenerator):
+    kanjis = [
+        {"kanji": "雨", "yomigana": "あめ"},
+        {"kanji": "雪", "yomigana": "ゆき"},
+        {"kanji": "雨", "yomigana": "あめ"},
+    ]
+    # Second 雨 must match after the first one, not the same position again
+    assert generator._map_yomigana("雨のち雨", kanjis) == {
+        0: ("あめ", 1, 0),
+        3: ("あめ", 1, 2),
+    }
+
+
+def test_map_yomigana_without_kanji(generator: CapCutGenerator):
+    assert generator._map_yomigana("ひらがなだけ", [{"kanji": "雨", "yomigana": "あめ"}]) == {}
+    assert generator._map_yomigana("雨", []) == {}
+
+
+def test_media_duration_is_cached_by_signature(generator: CapCutGenerator, tmp_path: Path, monkeypatch):
+    wav = _write_wav(tmp_path / "001.wav", 1.5)
+    assert generator._get_media_duration(wav) == 1_500_000
+
+    # Unchanged file: served from the cache without measuring again
+    def fail(path):
+        raise AssertionError("duration re-measured for an unchanged file")
+    monkeypatch.setattr(generator, "_get_audio_duration_fast", fail)
+    assert generator._get_media_duration(wav) == 1_500_000
+
+
+def test_media_duration_remeasures_changed_file(generator: CapCutGenerator, tmp_path: Path):
+    wav = _write_wav(tmp_path / "001.wav", 1.5)
+    assert generator._get_media_duration(wav) == 1_500_000
+
+    _write_wav(wav, 0.5)
+    stat = wav.stat()
+    os.utime(wav, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    assert generator._get_media_duration(wav) == 500_000
+    # One entry per path
+    assert list(generator._duration_cache) == [str(wav)]
+
+
+def test_duration_cache_round_trips_through_sidecar(generator: CapCutGenerator, tmp_path: Path, monkeypatch):
+    wav = _write_wav(tmp_path / "001.wav", 1.5)
+    generator._get_media_duration(wav)
+    generator._save_duration_cache()
+
+    assert (tmp_path / ".duration_cache.json").exists()
+    assert not (tmp_path / ".duration_cache.tmp").exists()
+
+    reloaded = CapCutGenerator(tmp_path)
+    monkeypatch.setattr(reloaded, "_get_audio_duration_fast", lambda path: 0)
+    assert reloaded._get_media_duration(wav) == 1_500_000
+
+
+def test_duration_cache_ignores_corrupt_sidecar(tmp_path: Path):
+    (tmp_path / ".duration_cache.json").write_text("{not json", encoding="utf-8")
+
+    assert CapCutGenerator(tmp_path)._duration_cache == {}
+
+
+def test_process_subtitles_ruby_layout_golden(generator: CapCutGenerator, tmp_path: Path):
+    """Golden positions for main text and ruby; a layout tweak must update these on purpose"""
+    subs = [
+        # Mixed width: ASCII counts as half width when centering the line
+        {"text": "日本のAI", "kanjis": [{"kanji": "日本", "yomigana": "にほん"}]},
+        # Wraps after 16 chars; the ruby sits over the second line
+        {"text": "あいうえおかきくけこさしすせそた東京タワー", "kanjis": [{"kanji": "東京", "yomigana": "とうきょう"}]},
+    ]
+    synced = tmp_path / "proj" / "subtitles" / "synced"
+    synced.mkdir(parents=True)
+    (synced / "ja.json").write_text(json.dumps(subs, ensure_ascii=False), encoding="utf-8")
+    generator.audio_segments_flat = [
+        {"target_timerange": {"start": 0, "duration": 1_000_000}},
+        {"target_timerange": {"start": 1_000_000, "duration": 2_000_000}},
+    ]
+
+    generator.process_subtitles("proj")
+
+    texts = {m["id"]: json.loads(m["content"])["text"] for m in generator.content["materials"]["texts"]}
+    layout = [
+        [
+            (texts[s["material_id"]], s["clip"]["transform"]["x"], s["clip"]["transform"]["y"],
+             s["clip"]["scale"]["x"], s["render_index"], s["target_timerange"]["start"])
+            for s in track["segments"]
+        ]
+        for track in generator.content["tracks"] if track["type"] == "text"
+    ]
+
+    assert layout == [
+        [
+            ("日本のAI", 0.5052, 0.6944, 1.0, 0, 0),
+            ("あいうえおかきくけこさしすせそた\n東京タワー", 0.5052, 0.6944, 1.0, 1, 1_000_000),
+        ],
+        # First kanji of every subtitle shares one ruby track
+        [
+            ("にほん", pytest.approx(0.442), pytest.approx(0.785), 0.6, 0, 0),
+            ("とうきょう", pytest.approx(0.413), pytest.approx(0.685), 0.6, 1, 1_000_000),
+        ],
+    ]
@@ -0,0 +1,102 @@
+"""Unit tests for core.gen_caption."""
+import sys
+import asyncio
+from pathlib import Path
+
+import numpy as np
+import pytest
+import soundfile as sf
+
+# Add project root to path
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from core.gen_caption import CaptionGenerator
+
+CAPTIONS = [
+    {
+        "start": "00:00:00,000", "end": "00:00:01,500",
+        "text_ja": "こんにちは", "text_en": "Hello", "text_ko": "안녕하세요",
+        "speaker": "A", "kanjis": [],
+    },
+    {
+        "start": "00:00:01,500", "end": "00:00:03,000",
+        "text_ja": "元気です", "text_en": "I'm fine",
+        "speaker": "", "kanjis": [],
+    },
+]
+
+
+def _generator() -> CaptionGenerator:
+    # _write_srts only formats; skip the client setup in __init__
+    return CaptionGenerator.__new__(CaptionGenerator)
+
+
+def test_write_srts_writes_every_language(tmp_path: Path):
+    paths = {lang: tmp_path / f"{lang}.srt" for lang in ("ja", "en", "ko")}
+    _generator()._write_srts(CAPTIONS, paths)
+
+    assert paths["ja"].read_text(encoding="utf-8") == (
+        "1\n00:00:00,000 --> 00:00:01,500\n[A] こんにちは\n\n"
+        "2\n00:00:01,500 --> 00:00:03,000\n元気です\n\n"
+    )
+    assert paths["en"].read_text(encoding="utf-8") == (
+        "1\n00:00:00,000 --> 00:00:01,500\n[A] Hello\n\n"
+        "2\n00:00:01,500 --> 00:00:03,000\nI'm fine\n\n"
+    )
+    # Missing translations still keep the cue so indices line up across languages
+    assert paths["ko"].read_text(encoding="utf-8") == (
+        "1\n00:00:00,000 --> 00:00:01,500\n[A] 안녕하세요\n\n"
+        "2\n00:00:01,500 --> 00:00:03,000\n\n\n"
+    )
+
+
+def test_write_srts_empty_captions(tmp_path: Path):
+    path = tmp_path / "ja.srt"
+    _generator()._write_srts([], {"ja": path})
+
+    assert path.read_text(encoding="utf-8") == ""
+
+
+def test_generate_xml_scenarios_keeps_successful_languages():
+    """One failing language comes back as its exception; the others still return XML"""
+    gen = _generator()
+    gen.batch_mode = False
+
+    async def fake_scenario(captions, target_lang):
+        if target_lang == "ko":
+            raise ValueError("Failed to generate valid XML scenario after 3 attempts.")
+        return f"<script><a>{target_lang}</a></script>"
+    gen.async_generate_xml_scenario = fake_scenario
+
+    results = asyncio.run(gen.async_generate_xml_scenarios([("ja", []), ("ko", []), ("en", [])]))
+
+    assert results[0] == "<script><a>ja</a></script>"
+    assert isinstance(results[1], ValueError)
+    assert results[2] == "<script><a>en</a></script>"
+
+
+def test_loudnorm_inproc_normalizes_short_clip(tmp_path: Path):
+    pyln = pytest.importorskip("pyloudnorm")
+    sr = 16000
+    src = tmp_path / "input.wav"
+    sf.write(str(src), 0.1 * np.sin(2 * np.pi * 220 * np.arange(sr * 3) / sr), sr, subtype="PCM_16")
+    out = tmp_path / "normalized.wav"
+
+    assert CaptionGenerator._loudnorm_inproc(src, out)
+    data, _ = sf.read(str(out))
+    assert pyln.Meter(sr).integrated_loudness(data) == pytest.approx(-16.0, abs=0.1)
+
+
+def test_loudnorm_inproc_defers_peaky_clip_to_ffmpeg(tmp_path: Path):
+    """The true-peak ceiling would stop the gain short, so the ffmpeg path takes over"""
+    pytest.importorskip("pyloudnorm")
+    sr = 16000
+    data = 0.01 * np.random.default_rng(0).standard_normal(sr * 3)
+    data[::sr // 2] = 0.9
+    src = tmp_path / "input.wav"
+    sf.write(str(src), data, sr, subtype="PCM_16")
+    out = tmp_path / "normalized.wav"
+
+    assert not CaptionGenerator._loudnorm_inproc(src, out)
+    assert not out.exists()
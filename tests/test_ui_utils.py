@@ -0,0 +1,51 @@
+"""Unit tests for ui.utils helpers."""
+import sys
+from pathlib import Path
+
+import pytest
+
+# The UI imports its helpers as the top-level `utils` package
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT / "ui"))
+
+from utils.subtitle_utils import ms_to_srt, srt_to_ms, format_timestamp_json
+from utils.formatters import log_color
+
+
+@pytest.mark.parametrize("ms, expected", [
+    (0, "00:00:00,000"),
+    (1_500, "00:00:01,500"),
+    (3_723_004, "01:02:03,004"),
+    (1_500.7, "00:00:01,500"),
+    (360_000_000, "100:00:00,000"),
+])
+def test_ms_to_srt(ms, expected):
+    assert ms_to_srt(ms) == expected
+
+
+@pytest.mark.parametrize("ms", [0, 999, 61_001, 3_723_004, 359_999_999])
+def test_ms_to_srt_round_trips(ms):
+    assert srt_to_ms(ms_to_srt(ms)) == ms
+
+
+@pytest.mark.parametrize("ms, expected", [
+    (2_232, "00:02:232"),
+    (143_408, "02:23:408"),
+    (2_232.9, "00:02:232"),
+    (6_000_000, "100:00:000"),
+])
+def test_format_timestamp_json(ms, expected):
+    assert format_timestamp_json(ms) == expected
+
+
+@pytest.mark.parametrize("message, expected", [
+    ("[ERROR] ffmpeg failed", "red"),
+    ("❌ Upload failed", "red"),
+    ("✅ Saved", "green"),
+    ("🎉 All done", "green"),
+    ("⚠️ Retrying", "orange"),
+    ("🛑 Stopped", "orange"),
+    ("[*] Processing 001.wav", "gray"),
+])
+def test_log_color(message, expected):
+    assert log_color(message) == expected
@@ -2,6 +2,16 @@
 import reflex as rx
 
 
+# Navbar application links (label, url)
+NAV_LINKS = (
+    ("📺 Extract", "/extract"),
+    ("📝 Review", "/review"),
+    ("🎬 Scenario", "/scenario"),
+    ("🎙️ Audio", "/audio"),
+    ("📝 Subtitle", "/subtitle"),
+    ("🎥 Project", "/project"),
+)
+
 
 def navbar() -> rx.Component:
     """Navigation Bar - Dark Mode & Premium Design"""
@@ -15,8 +25,11 @@ def navbar() -> rx.Component:
         "size": "2",
     }
     
+    # One router Var shared by every link
+    current_path = rx.State.router.page.path
+    
     def nav_link(text: str, url: str) -> rx.Component:
-        is_active = rx.State.router.page.path == url
+        is_active = current_path == url
         return rx.link(
             rx.text(text, **link_style),
             href=url,
@@ -42,12 +55,7 @@ def navbar() -> rx.Component:
             
             # Application Links - Absolutely Centered
             rx.hstack(
-                nav_link("📺 Extract", "/extract"),
-                nav_link("📝 Review", "/review"),
-                nav_link("🎬 Scenario", "/scenario"),
-                nav_link("🎙️ Audio", "/audio"),
-                nav_link("📝 Subtitle", "/subtitle"),
-                nav_link("🎥 Project", "/project"),
+                *[nav_link(text, url) for text, url in NAV_LINKS],
                 spacing="6",
                 position="absolute",
                 left="50%",
@@ -2,44 +2,32 @@
 import reflex as rx
 
 
-def log_viewer(logs: list[str]) -> rx.Component:
+def log_viewer(log_entries: list[tuple[str, str]]) -> rx.Component:
     """
     Display logs with auto-scroll to bottom (Console mirror).
     Always visible, even when empty. Full width with 200px height.
     Auto-scrolls to show latest logs.
     
     Args:
-        logs: List of log messages
+        log_entries: List of (message, color) pairs
         
     Returns:
         Log display component with console-style formatting
     """
     return rx.box(
         rx.cond(
-            logs.length() > 0,
+            log_entries.length() > 0,
             # Show logs with auto-scroll (reversed flex direction)
             rx.box(
                 rx.vstack(
                     rx.foreach(
-                        logs,
-                        lambda log: rx.text(
-                            log,
+                        log_entries,
+                        lambda entry: rx.text(
+                            entry[0],
                             font_family="'Fira Code', 'Courier New', monospace",
                             size="2",
                             white_space="pre", # No wrapping
-                            color=rx.cond(
-                                log.contains("ERROR") | log.contains("❌"),
-                                "red",
-                                rx.cond(
-                                    log.contains("✅") | log.contains("🎉"),
-                                    "green",
-                                    rx.cond(
-                                        log.contains("⚠️") | log.contains("🛑"),
-                                        "orange",
-                                        "gray"
-                                    )
-                                ),
-                            ),
+                            color=entry[1],  # Classified once by the State
                         ),
                     ),
                     spacing="1",
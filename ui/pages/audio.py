@@ -328,6 +328,6 @@ def page() -> rx.Component:
         ),
         
         # Logs
-        log_viewer(AudioState.generation_logs),
+        log_viewer(AudioState.visible_generation_logs),
         
     ], max_width="1200px")
@@ -137,7 +137,7 @@ def page() -> rx.Component:
         
         # Log Viewer (Console Mirror) - Full Width
         rx.vstack(
-            log_viewer(ExtractState.extraction_logs),
+            log_viewer(ExtractState.visible_extraction_logs),
             width="100%",
             spacing="3",
         ),
@@ -1,9 +1,11 @@
 """Audio Tab State Management - Simplified"""
 import reflex as rx
 from pathlib import Path
+import os
 import sys
 import asyncio
 import re
+import time
 from datetime import datetime
 
 # Add paths
@@ -17,6 +19,10 @@ if str(UI_DIR) not in sys.path:
 
 from core.gen_audio import GenAudio
 from core.gen_caption import CaptionGenerator
+from utils.formatters import log_color, LOG_VIEW_LIMIT
+
+# Minimum seconds between streamed log pushes to the browser; lines are still logged one by one
+LOG_PUSH_INTERVAL = 0.05
 
 
 class AudioState(rx.State):
@@ -56,7 +62,7 @@ class AudioState(rx.State):
     
     # Generation status
     is_generating: bool = False
-    generation_logs: list[str] = []
+    generation_logs: list[tuple[str, str]] = []  # (text, color)
     progress: int = 0
     progress_text: str = ""
 
@@ -192,6 +198,11 @@ class AudioState(rx.State):
         if value:
             self.speed_factor = float(value[0])
     
+    @rx.var
+    def visible_generation_logs(self) -> list[tuple[str, str]]:
+        """Tail of the generation logs shown in the log viewer"""
+        return self.generation_logs[-LOG_VIEW_LIMIT:]
+    
     @rx.var
     def can_generate(self) -> bool:
         """Can start generation"""
@@ -277,7 +288,7 @@ class AudioState(rx.State):
         )
 
         if is_progress and self.generation_logs:
-            last_msg = self.generation_logs[-1]
+            last_msg = self.generation_logs[-1][0]
             clean_last = re.sub(r'\x1B(?:[@-Z\\-_]|\[[0-?]*[ -/]*[@-~])', '', last_msg)
             
             last_is_progress = bool(
@@ -288,12 +299,12 @@ class AudioState(rx.State):
             
             if last_is_progress:
                 # Replace the last item efficiently
-                self.generation_logs[-1] = message
+                self.generation_logs[-1] = (message, log_color(message))
                 return
         
-        self.generation_logs.append(message)
+        self.generation_logs.append((message, log_color(message)))
     
-    def _ensure_ref_text(self, audio_path: Path, lang: str = "ja") -> str:
+    async def _ensure_ref_text(self, audio_path: Path, lang: str = "ja") -> str:
         """Ensure reference text exists for audio"""
         txt_path = audio_path.with_suffix(".txt")
         if txt_path.exists():
@@ -302,8 +313,10 @@ class AudioState(rx.State):
         # Transcribe
         self.log(f"[*] Transcribing reference audio due to missing text: {audio_path.name}")
         try:
-            gen = CaptionGenerator()
-            text = gen.simple_transcribe(audio_path, lang)
+            # Constructing the generator imports google-genai and reads config/.env, so keep
+            # that off the event loop; the Gemini calls themselves are awaited natively
+            gen = await asyncio.to_thread(CaptionGenerator)
+            text = await gen.async_simple_transcribe(audio_path, lang)
             
             if text:
                 txt_path.write_text(text, encoding="utf-8")
@@ -313,6 +326,13 @@ class AudioState(rx.State):
             self.log(f"[!] Transcription failed: {e}")
             return ""
 
+    def _log_optimized(self, tasks: list[asyncio.Task]):
+        """Log the background optimizations that have finished and drop them from tasks."""
+        for task in [t for t in tasks if t.done()]:
+            tasks.remove(task)
+            for log_line in task.result():
+                self.log(log_line)
+
     async def start_generation(self):
         """Start TTS generation"""
         if not self.can_generate:
@@ -368,6 +388,17 @@ class AudioState(rx.State):
             self.log(f"[*] Found {len(scenarios)} scenarios with total {total_lines} lines.")
             processed_lines = 0
             
+            # Finished clips are optimized in the background while the next line generates
+            # (at most one ffmpeg per core); clips still queued at a cancel are skipped
+            optimize_sem = asyncio.Semaphore(os.cpu_count() or 1)
+            optimizing: list[asyncio.Task] = []
+            
+            async def optimize_clip(path: Path) -> list[str]:
+                async with optimize_sem:
+                    if self.cancel_requested:
+                        return []
+                    return [log async for log in audio_generator.optimize_audio(path)]
+            
             # Cache all available voice files once for fuzzy matching
             input_root = PARENT_DIR / "assets/audios"
             all_voice_files = []
@@ -386,9 +417,9 @@ class AudioState(rx.State):
                 for idx, (voice_name, text) in enumerate(matches):
                     # Check Cancellation
                     if self.cancel_requested:
-                        self.log("[!] Cancellation Requested.")
-                        yield rx.toast.warning("Generation Cancelled.")
-                        return
+                        break
+                    
+                    self._log_optimized(optimizing)
 
                     # Progress Check
                     self.progress = int((processed_lines / total_lines) * 100)
@@ -425,7 +456,7 @@ class AudioState(rx.State):
                             break
                     
                     # Ensure Ref Text
-                    ref_text = self._ensure_ref_text(ref_audio_path, ref_lang)
+                    ref_text = await self._ensure_ref_text(ref_audio_path, ref_lang)
                     if not ref_text:
                         self.log(f"[!] Missing ref text for {voice_name}. Skipping line.")
                         processed_lines += 1
@@ -443,6 +474,7 @@ class AudioState(rx.State):
                     
                     try:
                         # Use Async Generator for Real-Time Logs
+                        last_push = 0.0
                         async for log_line in audio_generator.async_generate_voice(
                             gpt_model_path=gpt_path,
                             sovits_model_path=sovits_path,
@@ -454,10 +486,12 @@ class AudioState(rx.State):
                             output_path=out_file,
                             speed_factor=self.speed_factor,
                         ):
-                             # Yield log updates to UI
+                             # Yield log updates to UI (throttled: one state delta per interval)
                              if log_line:
                                 self.log(log_line)
-                                yield 
+                                if time.monotonic() - last_push >= LOG_PUSH_INTERVAL:
+                                    last_push = time.monotonic()
+                                    yield
                              
                              # Check Cancellation mid-stream? 
                              # Ideally we should kill subprocess too but for now just break loop
@@ -465,24 +499,33 @@ class AudioState(rx.State):
                                  break
                         
                         if self.cancel_requested:
-                             self.log("[!] Cancellation Requested.")
-                             yield rx.toast.warning("Generation Cancelled.")
-                             return
+                             break
 
                     except Exception as e:
                         self.log(f"[!] Generation Error: {e}")
+                    yield  # Flush lines held back by the throttle
                         
-                    # Optimization Step
-                    if not self.cancel_requested and out_file.exists():
-                        try:
-                            async for log_line in audio_generator.optimize_audio(out_file):
-                                if log_line:
-                                    self.log(log_line)
-                                    yield 
-                        except Exception as e:
-                            self.log(f"[!] Optimization Error: {e}")
+                    if out_file.exists() and not self.cancel_requested:
+                        optimizing.append(asyncio.ensure_future(optimize_clip(out_file)))
                     
                     processed_lines += 1
+                
+                if self.cancel_requested:
+                    break
+            
+            # Wait for the optimizations still running (queued ones skip themselves after a cancel)
+            if optimizing:
+                if not self.cancel_requested:
+                    self.progress_text = f"Optimizing... ({len(optimizing)} files)"
+                yield
+                await asyncio.wait(optimizing)
+                self._log_optimized(optimizing)
+                yield
+            
+            if self.cancel_requested:
+                self.log("[!] Cancellation Requested.")
+                yield rx.toast.warning("Generation Cancelled.")
+                return
             
             self.progress = 100
             self.progress_text = "Done!"
@@ -702,11 +745,14 @@ class ScenarioState(rx.State):
         yield rx.toast.info("Starting scenario generation...")
         
         try:
-            generator = CaptionGenerator()
+            # Constructing the generator imports google-genai and reads config/.env; keep it off the event loop
+            generator = await asyncio.to_thread(CaptionGenerator)
             output_root = PARENT_DIR / "workspace" / self.selected_project
             subtitle_dir = output_root / "subtitles"
             
             generated_langs = []
+            failed_langs = []
+            jobs = []
             
             for lang in ["ja", "ko", "en"]:
                 srt_path = subtitle_dir / f"{lang}.srt"
@@ -740,7 +786,17 @@ class ScenarioState(rx.State):
                 if not captions:
                     continue
 
-                xml_content = generator.generate_xml_scenario(captions, lang)
+                jobs.append((lang, captions))
+            
+            # Languages are independent: concurrent realtime calls, or one batch job in batch mode
+            results = await generator.async_generate_xml_scenarios(jobs)
+            
+            for (lang, _), xml_content in zip(jobs, results):
+                if isinstance(xml_content, Exception):
+                    # Keep the languages that succeeded
+                    print(f"[!] Scenario generation failed for {lang}: {xml_content}")
+                    failed_langs.append(lang)
+                    continue
                 
                 # Post-process: Map generic tags to specific voice names
                 if xml_content and lang in self.selected_voices:
@@ -756,9 +812,11 @@ class ScenarioState(rx.State):
                 xml_path.write_text(xml_content, encoding="utf-8")
                 generated_langs.append(lang)
             
+            if failed_langs:
+                yield rx.toast.warning(f"Scenario generation failed for: {', '.join(failed_langs)}")
             if generated_langs:
                 yield rx.toast.success(f"Generated scenarios for: {', '.join(generated_langs)}")
-            else:
+            elif not failed_langs:
                 yield rx.toast.error("No scenarios generated. Please check subtitles.")
                 
         except Exception as e:
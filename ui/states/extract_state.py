@@ -22,6 +22,7 @@ if sys.platform == "win32":
     sys.stderr.reconfigure(encoding='utf-8')
 
 from core.gen_caption import CaptionGenerator
+from utils.formatters import log_color, LOG_VIEW_LIMIT
 
 
 class ExtractState(rx.State):
@@ -42,7 +43,7 @@ class ExtractState(rx.State):
     
     # Extraction status
     is_extracting: bool = False
-    extraction_logs: list[str] = []
+    extraction_logs: list[tuple[str, str]] = []  # (text, color)
     should_stop: bool = False  # Flag for graceful stop
     
     # Computed properties
@@ -56,6 +57,11 @@ class ExtractState(rx.State):
         """Parse speaker count"""
         return 5 if self.selected_speakers == "5+" else int(self.selected_speakers)
     
+    @rx.var
+    def visible_extraction_logs(self) -> list[tuple[str, str]]:
+        """Tail of the extraction logs shown in the log viewer"""
+        return self.extraction_logs[-LOG_VIEW_LIMIT:]
+    
     # Explicit setters
     def set_selected_file(self, value: str):
         """Set selected file"""
@@ -96,7 +102,7 @@ class ExtractState(rx.State):
         import datetime
         timestamp = datetime.datetime.now().strftime("%H:%M:%S")
         formatted = f"[{timestamp}] {message}"
-        self.extraction_logs.append(formatted)
+        self.extraction_logs.append((formatted, log_color(formatted)))
         try:
             print(formatted)  # Console mirror
         except UnicodeEncodeError:
@@ -1,5 +1,8 @@
 """Formatting Utilities"""
 
+# Log viewer only renders the tail; it auto-scrolls to the bottom anyway
+LOG_VIEW_LIMIT = 200
+
 
 def srt_to_ms(timestamp: str) -> int:
     """
@@ -35,3 +38,22 @@ def ms_to_srt(ms: int) -> str:
     s = seconds % 60
     
     return f"{h:02d}:{m:02d}:{s:06.3f}".replace(".", ",")
+
+
+def log_color(message: str) -> str:
+    """
+    Classify a log line into the color the log viewer renders it with.
+    
+    Args:
+        message: Log line
+        
+    Returns:
+        "red", "green", "orange" or "gray"
+    """
+    if "ERROR" in message or "❌" in message:
+        return "red"
+    if "✅" in message or "🎉" in message:
+        return "green"
+    if "⚠️" in message or "🛑" in message:
+        return "orange"
+    return "gray"
@@ -9,6 +9,10 @@ try:
 except ImportError:
     SUDACHI_AVAILABLE = False
 
+# Zero-padded digit strings for timestamp formatting (lookup instead of format specs)
+_D2 = tuple(f"{i:02d}" for i in range(100))
+_D3 = tuple(f"{i:03d}" for i in range(1000))
+
 def parse_srt(file_path: Path):
     if not file_path.exists():
         return []
@@ -100,20 +104,21 @@ def srt_to_ms(time_str: str) -> int:
 
 def ms_to_srt(total_ms: int) -> str:
     """Converts milliseconds to SRT timestamp 'HH:MM:SS,mmm'."""
-    hours = total_ms // 3600000
-    total_ms %= 3600000
-    minutes = total_ms // 60000
-    total_ms %= 60000
-    seconds = total_ms // 1000
-    milliseconds = total_ms % 1000
+    total_ms = int(total_ms)
+    hours, rem = divmod(total_ms, 3600000)
+    minutes, rem = divmod(rem, 60000)
+    seconds, milliseconds = divmod(rem, 1000)
     
-    return f"{int(hours):02}:{int(minutes):02}:{int(seconds):02},{int(milliseconds):03}"
+    if 0 <= hours < 100:
+        return f"{_D2[hours]}:{_D2[minutes]}:{_D2[seconds]},{_D3[milliseconds]}"
+    return f"{hours:02}:{minutes:02}:{seconds:02},{milliseconds:03}"
 
 def format_timestamp_json(ms_total: int) -> str:
     """Formats milliseconds to JSON format MM:SS:fff (e.g. 02:23:408)"""
     # Note: User sample '00:02:232' (2s 232ms) -> MM:SS:mmm
-    seconds = ms_total // 1000
-    ms = ms_total % 1000
-    minutes = seconds // 60
-    secs = seconds % 60
+    ms_total = int(ms_total)
+    seconds, ms = divmod(ms_total, 1000)
+    minutes, secs = divmod(seconds, 60)
+    if 0 <= minutes < 100:
+        return f"{_D2[minutes]}:{_D2[secs]}:{_D3[ms]}"
     return f"{minutes:02}:{secs:02}:{ms:03}"